@@ -9,8 +9,9 @@ from PySide6.QtWidgets import QApplication
 from PySide6 import __version__ as PYSIDE6_VERSION
 
 from pvmc.ui.main_window import PentaVMControlMainWindow
-from pvmc.logging_utils import attach_to_root, set_debug_enabled
-from pvmc.config import ConfigManager
+from pvmc.logging_utils import attach_to_root, set_debug_enabled, start_queue_logging
+from pvmc.config import get_config_manager
+from pvmc import tracing
 
 
 def setup_logging():
@@ -22,8 +23,10 @@ def setup_logging():
         root.addHandler(handler)
     # Respect user setting for debug verbosity (and silence entirely when off)
     try:
-        cm = ConfigManager()
+        # Shared with the main window, so config.json is read once per process
+        cm = get_config_manager()
         debug_on = cm.get_bool('debug_logging', True)
+        tracing.apply_levels(cm.config.get('trace_levels'))
     except Exception:
         debug_on = True
     set_debug_enabled(bool(debug_on))
@@ -54,6 +57,8 @@ def setup_logging():
         attach_to_root()
     except Exception:
         pass
+    # Console and buffer writes move to a listener thread; logging on the GUI thread only enqueues
+    start_queue_logging()
 
 
 def main():
@@ -0,0 +1,90 @@
+"""Full WrapPanel repaint: per-card QGraphicsDropShadowEffect vs cached panel-painted shadows.
+
+Usage:
+  python benchmarks/bench_card_paint.py [--cards 300] [--rounds 20]
+
+Set QT_QPA_PLATFORM=offscreen to run without a display.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication, QGraphicsDropShadowEffect
+
+from pvmc.config import ConfigManager
+from pvmc.theme import ThemeManager
+from pvmc.ui.widgets.vm_card import VMCard
+from pvmc.ui.widgets.wrap_panel import WrapPanel
+
+
+def _vm(i):
+    return {
+        'server': 'bench', 'server_label': 'bench', 'server_color': '#335577' if i % 2 else None,
+        'name': f'vm-{i:04d}', 'uuid': '', 'instance_uuid': '', 'moid': f'vm-{i}',
+        'power_state': 'poweredOn', 'res': {'cpu_mhz': 0, 'mem_mb': 0, 'disk_gb': 0.0},
+    }
+
+
+def build_panel(tm, n, legacy):
+    panel = WrapPanel(margin=8, hspacing=8, vspacing=8)
+    panel.resize(1900, 1000)
+    cards = []
+    for i in range(n):
+        card = VMCard(tm, _vm(i), None, None, None)
+        card.setFixedSize(160, 48)
+        if legacy:
+            # What every card used to install
+            eff = QGraphicsDropShadowEffect(card)
+            eff.setColor(QColor('#000000'))
+            eff.setOffset(2, 2)
+            eff.setBlurRadius(6)
+            card.setGraphicsEffect(eff)
+            card.has_shadow = lambda: False
+        cards.append(card)
+    panel.addWidgets(cards)
+    panel.show()
+    return panel
+
+
+def time_repaints(panel, rounds):
+    img = QImage(panel.size(), QImage.Format_ARGB32_Premultiplied)
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        panel.render(img)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--cards', type=int, default=300)
+    ap.add_argument('--rounds', type=int, default=20)
+    args = ap.parse_args()
+    app = QApplication.instance() or QApplication(sys.argv)
+    # Throwaway config dir, so a benchmark run never creates or migrates the user's settings
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['APPDATA'] = tmp
+        cm = ConfigManager()
+        tm = ThemeManager(cm)
+        for label, legacy in (('effect per card', True), ('cached shadows', False)):
+            panel = build_panel(tm, args.cards, legacy)
+            app.processEvents()
+            time_repaints(panel, 2)  # warm caches
+            s = time_repaints(panel, args.rounds)
+            print(f'{label:>16}: {args.cards} cards  median {statistics.median(s):7.2f} ms  '
+                  f'min {min(s):7.2f} ms  max {max(s):7.2f} ms')
+            panel.clear()
+            panel.deleteLater()
+            app.processEvents()
+        cm.flush()
+
+
+if __name__ == '__main__':
+    main()
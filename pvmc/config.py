@@ -1,18 +1,80 @@
+import atexit
 import json
+import logging
 import os
 import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
+
+# Quiet period after the last change before config.json is rewritten
+SAVE_DEBOUNCE_S = 0.5
+
+THEME_INDEX_FILE = 'index.json'
+THEME_INDEX_VERSION = 1
+# Written into each theme file alongside the theme's own values
+THEME_KEY_FIELD = '_theme_key'
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """One published version of the config, deep-frozen; safe to read from any thread without locking."""
+    version: int
+    values: Mapping
+
+    @property
+    def servers(self):
+        return self.values.get('servers', ())
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def get_bool(self, key, default=False):
+        return bool(self.values.get(key, default))
+
+    def get_int(self, key, default=0):
+        try:
+            return int(self.values.get(key, default))
+        except Exception:
+            return int(default)
 
 
 class ConfigManager:
+    """config.json with write-behind persistence.
+
+    Setters change the in-memory config and mark it dirty; the file is rewritten once,
+    SAVE_DEBOUNCE_S after the last change, or immediately by flush() (called on window close
+    and at interpreter exit). Writes are skipped when the serialized config is unchanged.
+    """
+
     def __init__(self):
         self._lock = threading.RLock()
+        self._dirty = False
+        self._deadline = 0.0
+        self._timer = None
+        # Exactly what is on disk, so unchanged configs are never rewritten
+        self._written = None
         self.appdata = os.path.join(os.environ.get('APPDATA', str(Path.home())), 'PentaStarVMBar')
         self.config_path = os.path.join(self.appdata, 'config.json')
         self.themes_dir = os.path.join(self.appdata, 'themes')
         self.icons_dir = os.path.join(self.appdata, 'icons')
         self._ensure_dirs()
+        # Bumped whenever theme data or the active theme may have changed; ThemeManager recompiles on change
+        self.theme_revision = 0
         self.config = self._load_or_create()
+        self._snapshot = None
+        self._publish()
+        atexit.register(self.flush)
 
     def _ensure_dirs(self):
         os.makedirs(self.appdata, exist_ok=True)
@@ -253,41 +315,266 @@ class ConfigManager:
             'vmrc_path': '',
             'disable_appbar': False,
             'skip_inventory_on_startup': False,
+            'push_updates': False,
+            'max_parallel_hosts': 4,
+            'host_timeout_s': 20,
+            # Above this many VMs the bar paints cards in a virtualized list (0 = never)
+            'virtualize_above_vms': 400,
+            # Per-tag log levels, e.g. {"WRAP": "TRACE", "DOCK": "OFF"}; see pvmc/tracing.py
+            'trace_levels': {},
+            # GUI thread blocked this long (ms) gets its stack captured; 0 turns the watchdog off
+            'stall_threshold_ms': 500,
             'side_panel_width': 50,
             'metrics_panel_width': 180
         }
 
     def _load_or_create(self):
+        d = self._defaults()
+        builtin_themes = d.pop('themes')
+        self._load_theme_index()
         if not os.path.exists(self.config_path):
-            cfg = self._defaults()
-            self._save(cfg)
+            cfg = d
+            self._add_missing_themes(builtin_themes)
+            self._flush_themes()
+            self._write(json.dumps(cfg, indent=2))
             return cfg
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
                 cfg = json.load(f)
+            changed = False
         except Exception:
-            cfg = self._defaults()
-        d = self._defaults()
+            cfg = d
+            changed = True
+        legacy = cfg.pop('themes', None)
+        if isinstance(legacy, dict):
+            # Older configs embedded every theme; move them out to themes_dir once
+            logging.info(f'[CFG] Migrating {len(legacy)} theme(s) from config.json to {self.themes_dir}')
+            self._add_missing_themes(legacy)
+            changed = True
         for k, v in d.items():
             if k not in cfg:
                 cfg[k] = v
-        if 'themes' in d:
-            for name, theme in d['themes'].items():
-                if name not in cfg['themes']:
-                    cfg['themes'][name] = theme
-        self._save(cfg)
+                changed = True
+        self._add_missing_themes(builtin_themes)
+        # Theme files first, so a crash in between never leaves config.json pointing at nothing
+        self._flush_themes()
+        text = json.dumps(cfg, indent=2)
+        if changed:
+            self._write(text)
+        else:
+            self._written = text
         return cfg
 
-    def _save(self, cfg=None):
-        with self._lock:
-            data = cfg if cfg is not None else self.config
-            tmp = self.config_path + '.tmp'
+    def _atomic_write(self, path, text):
+        tmp = path + '.tmp'
+        try:
             with open(tmp, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            os.replace(tmp, self.config_path)
+                f.write(text)
+            os.replace(tmp, path)
+            return True
+        except Exception as e:
+            logging.info(f'[CFG] save failed for {os.path.basename(path)}: {type(e).__name__}: {e}')
+            return False
+
+    def _write(self, text):
+        with self._lock:
+            if self._atomic_write(self.config_path, text):
+                self._written = text
+                return True
+            return False
+
+    def _save(self):
+        """Publish a new snapshot, mark the config dirty and (re)arm the debounced write."""
+        with self._lock:
+            self._publish()
+            self._dirty = True
+            self._touch()
+
+    def _publish(self):
+        # Copy-on-write: readers keep whatever snapshot they already hold
+        version = self._snapshot.version + 1 if self._snapshot is not None else 1
+        self._snapshot = ConfigSnapshot(version=version, values=_freeze(self.config))
+
+    def snapshot(self):
+        """The current ConfigSnapshot; lock-free, for worker threads."""
+        return self._snapshot
+
+    def _touch(self):
+        self._deadline = time.monotonic() + SAVE_DEBOUNCE_S
+        if self._timer is None:
+            self._arm(SAVE_DEBOUNCE_S)
+
+    def _arm(self, delay):
+        # One timer thread at a time; later changes just push the deadline out
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            if threading.current_thread() is not self._timer:
+                # Superseded by flush() or a newer timer while waiting for the lock
+                return
+            remaining = self._deadline - time.monotonic()
+            if remaining > 0:
+                self._arm(remaining)
+                return
+            self._timer = None
+            self.flush()
+
+    def flush(self):
+        """Write pending changes now; returns True if anything was rewritten."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            wrote = self._flush_themes()
+            if not self._dirty:
+                return wrote
+            try:
+                text = json.dumps(self.config, indent=2)
+            except RuntimeError:
+                # Config was edited in place mid-dump; retry after the next quiet period
+                self._touch()
+                return wrote
+            if text == self._written:
+                self._dirty = False
+                return wrote
+            if self._write(text):
+                self._dirty = False
+                return True
+            return wrote
 
     def save(self):
-        self._save()
+        """Persist (and publish) after editing config or a dict returned by get_theme in place."""
+        with self._lock:
+            self.theme_revision += 1
+            self._dirty_themes.update(self._themes)
+            self._save()
+
+    # Themes live in themes_dir, one JSON file each, listed by index.json (name -> file).
+    # Only the index is read at startup; a theme's file is parsed the first time it is asked for.
+
+    def _index_path(self):
+        return os.path.join(self.themes_dir, THEME_INDEX_FILE)
+
+    def _load_theme_index(self):
+        self._theme_files = {}
+        self._themes = {}
+        self._theme_written = {}
+        self._dirty_themes = set()
+        self._deleted_theme_files = set()
+        self._index_dirty = False
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == THEME_INDEX_VERSION:
+                self._theme_files = dict(data.get('themes', {}))
+                return
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.info(f'[CFG] Theme index unreadable, rebuilding: {type(e).__name__}: {e}')
+        self._rebuild_theme_index()
+
+    def _rebuild_theme_index(self):
+        # Recovery only: reads every theme file to learn its name
+        try:
+            files = sorted(n for n in os.listdir(self.themes_dir) if n.endswith('.json') and n != THEME_INDEX_FILE)
+        except Exception:
+            files = []
+        for fn in files:
+            try:
+                with open(os.path.join(self.themes_dir, fn), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                name = data.pop(THEME_KEY_FIELD, None) or Path(fn).stem
+                self._theme_files[name] = fn
+            except Exception:
+                continue
+        self._index_dirty = bool(self._theme_files)
+
+    def _theme_filename(self, name):
+        stem = ''.join(c if c.isalnum() or c in '-_' else '_' for c in name) or 'theme'
+        used = set(self._theme_files.values()) | {THEME_INDEX_FILE}
+        fn, i = f'{stem}.json', 1
+        while fn in used:
+            i += 1
+            fn = f'{stem}_{i}.json'
+        return fn
+
+    def _add_missing_themes(self, themes):
+        for name, data in themes.items():
+            if name not in self._theme_files:
+                self._put_theme(name, dict(data))
+
+    def _put_theme(self, name, data):
+        if name not in self._theme_files:
+            self._theme_files[name] = self._theme_filename(name)
+            self._index_dirty = True
+        self._themes[name] = data
+        self._dirty_themes.add(name)
+
+    def _load_theme_file(self, name):
+        fn = self._theme_files.get(name)
+        if not fn:
+            return None
+        try:
+            with open(os.path.join(self.themes_dir, fn), 'r', encoding='utf-8') as f:
+                text = f.read()
+            data = json.loads(text)
+            data.pop(THEME_KEY_FIELD, None)
+            self._theme_written[name] = text
+            return data
+        except Exception as e:
+            logging.info(f'[CFG] Theme {name!r} could not be loaded: {type(e).__name__}: {e}')
+            return None
+
+    def _flush_themes(self):
+        wrote = False
+        for name in list(self._dirty_themes):
+            data = self._themes.get(name)
+            fn = self._theme_files.get(name)
+            if data is None or fn is None:
+                self._dirty_themes.discard(name)
+                continue
+            try:
+                # The index key is stored in the file too, so the index can be rebuilt from the files
+                text = json.dumps({THEME_KEY_FIELD: name, **data}, indent=2)
+            except RuntimeError:
+                self._touch()
+                continue
+            if text != self._theme_written.get(name):
+                if not self._atomic_write(os.path.join(self.themes_dir, fn), text):
+                    continue
+                self._theme_written[name] = text
+                wrote = True
+            self._dirty_themes.discard(name)
+        if self._index_dirty:
+            text = json.dumps({'version': THEME_INDEX_VERSION, 'themes': self._theme_files}, indent=2)
+            if self._atomic_write(self._index_path(), text):
+                self._index_dirty = False
+                wrote = True
+        for fn in list(self._deleted_theme_files):
+            if fn in self._theme_files.values():
+                self._deleted_theme_files.discard(fn)
+                continue
+            try:
+                os.remove(os.path.join(self.themes_dir, fn))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.info(f'[CFG] Could not remove theme file {fn}: {type(e).__name__}: {e}')
+                continue
+            self._deleted_theme_files.discard(fn)
+        return wrote
+
+    def list_theme_names(self):
+        with self._lock:
+            return list(self._theme_files)
+
+    def has_theme(self, name):
+        with self._lock:
+            return name in self._theme_files
 
     def get_servers(self):
         return list(self.config.get('servers', []))
@@ -299,20 +586,70 @@ class ConfigManager:
     def get_active_theme_name(self):
         return self.config.get('active_theme', 'default_dark')
 
+    def _cached_theme(self, name):
+        t = self._themes.get(name)
+        if t is None and name in self._theme_files:
+            t = self._load_theme_file(name)
+            if t is not None:
+                self._themes[name] = t
+        return t
+
     def get_theme(self, name=None):
         name = name or self.get_active_theme_name()
-        themes = self.config.get('themes', {})
-        t = themes.get(name)
-        if not t:
-            t = list(themes.values())[0] if themes else self._defaults()['themes']['default_dark']
-        return t
+        with self._lock:
+            t = self._cached_theme(name)
+            if not t:
+                for other in self._theme_files:
+                    t = self._cached_theme(other)
+                    if t:
+                        break
+            if not t:
+                t = self._defaults()['themes']['default_dark']
+            return t
 
     def set_theme(self, name, data):
-        self.config.setdefault('themes', {})[name] = data
-        self._save()
+        with self._lock:
+            self._put_theme(name, data)
+            self.theme_revision += 1
+            self._touch()
+
+    def delete_theme(self, name):
+        """Remove a theme and its file; the active theme and the last theme cannot be deleted."""
+        with self._lock:
+            if name not in self._theme_files or name == self.get_active_theme_name() or len(self._theme_files) <= 1:
+                return False
+            self._deleted_theme_files.add(self._theme_files.pop(name))
+            self._themes.pop(name, None)
+            self._theme_written.pop(name, None)
+            self._dirty_themes.discard(name)
+            self._index_dirty = True
+            self.theme_revision += 1
+            self._touch()
+            return True
+
+    def rename_theme(self, old_name, new_name, data=None):
+        """Store old_name's theme (or data) under new_name, following it with the active theme."""
+        with self._lock:
+            if old_name not in self._theme_files or (new_name != old_name and new_name in self._theme_files):
+                return False
+            t = dict(data if data is not None else self.get_theme(old_name))
+            if new_name != old_name:
+                self._deleted_theme_files.add(self._theme_files.pop(old_name))
+                self._themes.pop(old_name, None)
+                self._theme_written.pop(old_name, None)
+                self._dirty_themes.discard(old_name)
+                self._index_dirty = True
+                if self.get_active_theme_name() == old_name:
+                    self.config['active_theme'] = new_name
+                    self._save()
+            self._put_theme(new_name, t)
+            self.theme_revision += 1
+            self._touch()
+            return True
 
     def set_active_theme(self, name):
         self.config['active_theme'] = name
+        self.theme_revision += 1
         self._save()
 
     def import_theme(self, path):
@@ -368,9 +705,33 @@ class ConfigManager:
         self.config[key] = bool(value)
         self._save()
 
+    def get_int(self, key, default=0):
+        try:
+            return int(self.config.get(key, default))
+        except Exception:
+            return int(default)
+
+    def set_int(self, key, value):
+        self.config[key] = int(value)
+        self._save()
+
     def get_vmrc_path(self):
         return self.config.get('vmrc_path', '')
 
     def set_vmrc_path(self, path):
         self.config['vmrc_path'] = path
         self._save()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_config_manager():
+    """The process-wide ConfigManager, created (and config.json read) on first use."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = ConfigManager()
+    return _shared
@@ -6,6 +6,9 @@ import traceback
 from urllib.parse import quote
 import hashlib
 import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 try:
     import winreg  # type: ignore
 except Exception:
@@ -13,16 +16,147 @@ except Exception:
 
 try:
     from pyVim.connect import SmartConnect, Disconnect
-    from pyVmomi import vim
+    from pyVmomi import vim, vmodl
 except Exception:
     SmartConnect = None
     Disconnect = None
     vim = None
+    vmodl = None
+
+from . import perf, tracing
+from .session_pool import SessionPool, session_lost_errors
+from .inventory import VM_PROPERTIES, build_host_metrics, build_vm_record, host_specs, moid_of, retrieve_properties, split_by_type
+from .watcher import HTTP_TIMEOUT_S, HostWatcher
 
 
 class ESXiClient:
-    def __init__(self, show_running_only=True):
+    def __init__(self, show_running_only=True, max_parallel_hosts=4, host_timeout=20.0):
         self.show_running_only = show_running_only
+        self.host_timeout = float(host_timeout)
+        # A SOAP call may not outlive the host's deadline, or a dead host keeps its worker past it
+        self.sessions = SessionPool(http_timeout=min(60.0, self.host_timeout))
+        # Watchers long-poll for up to MAX_WAIT_S, so they get their own sessions with a longer socket timeout
+        self.watch_sessions = SessionPool(http_timeout=HTTP_TIMEOUT_S)
+        self._watchers = []
+        self.max_parallel_hosts = max(1, int(max_parallel_hosts))
+        # Hosts still queued after this many host timeouts are skipped for the cycle
+        self.cycle_timeout_factor = 2.0
+        self._executor = ThreadPoolExecutor(max_workers=self.max_parallel_hosts, thread_name_prefix='pvmc-host')
+        # (tag, host) -> future of the latest call submitted for that host
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        # host -> reason for every host that failed or timed out in the last fetch
+        self.last_failed_hosts = {}
+        # host -> (moids seen in the last inventory read, monotonic time of that read)
+        self._known_moids = {}
+        self.known_moid_ttl = 300.0
+        # Resolved vmrc:// shell command from the registry; False once looked up and absent
+        self._vmrc_handler = None
+
+    def close(self):
+        """Log out of all pooled sessions; call once when the app shuts down."""
+        self.stop_watching()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.sessions.close()
+        self.watch_sessions.close()
+
+    def set_concurrency(self, max_parallel_hosts, host_timeout=None):
+        n = max(1, int(max_parallel_hosts))
+        if host_timeout is not None:
+            self.host_timeout = float(host_timeout)
+            self.sessions.http_timeout = min(60.0, self.host_timeout)
+        if n != self.max_parallel_hosts:
+            old = self._executor
+            self.max_parallel_hosts = n
+            self._executor = ThreadPoolExecutor(max_workers=n, thread_name_prefix='pvmc-host')
+            old.shutdown(wait=False)
+
+    def _for_each_host(self, servers, fn, tag):
+        """Run fn(server) for every server on the worker pool.
+
+        Returns (results, failed): results in server order (None for hosts that failed) and
+        a {host: reason} dict. Each host gets host_timeout seconds from the moment its call
+        starts on a worker; one that overruns is reported as timed out and no longer holds up
+        the cycle. Hosts still queued after cycle_timeout_factor * host_timeout (workers all
+        busy) are dropped for this cycle. A host whose call from an earlier cycle is still
+        running is not submitted again until that call returns.
+        """
+        results = [None] * len(servers)
+        failed = {}
+        futures = {}
+        started = {}
+
+        def _run(i, s):
+            started[i] = time.monotonic()
+            return fn(s)
+
+        with self._inflight_lock:
+            for i, s in enumerate(servers):
+                host = s.get('host')
+                prev = self._inflight.get((tag, host))
+                if prev is not None and not prev.done():
+                    failed[host] = 'previous call still running'
+                    logging.warning(f'[{tag}] {host}: previous call still running; skipping this cycle')
+                    continue
+                f = self._executor.submit(_run, i, s)
+                self._inflight[(tag, host)] = f
+                futures[f] = i
+        cycle_deadline = time.monotonic() + self.host_timeout * self.cycle_timeout_factor
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            for f in done:
+                i = futures[f]
+                host = servers[i].get('host')
+                try:
+                    results[i] = f.result()
+                except Exception as e:
+                    failed[host] = f'{type(e).__name__}: {e}'
+                    logging.info(f'[{tag}] error {host}: {e}')
+                    traceback.print_exception(type(e), e, e.__traceback__)
+            now = time.monotonic()
+            for f in list(pending):
+                i = futures[f]
+                host = servers[i].get('host')
+                t0 = started.get(i)
+                if t0 is not None:
+                    if now - t0 > self.host_timeout:
+                        # Still running: it stays in _inflight until it returns
+                        failed[host] = f'timed out after {self.host_timeout:.0f}s'
+                        logging.warning(f'[{tag}] {host}: no answer within {self.host_timeout:.0f}s; skipping this cycle')
+                        pending.discard(f)
+                elif now > cycle_deadline and f.cancel():
+                    failed[host] = 'not started: all workers busy'
+                    logging.warning(f'[{tag}] {host}: still queued behind busy hosts; skipping this cycle')
+                    pending.discard(f)
+        return results, failed
+
+    def start_watching(self, servers, on_event):
+        """Push mode: follow every server with a HostWatcher; on_event is called from worker threads."""
+        self.stop_watching()
+        if not SmartConnect or not vim:
+            logging.info('[INV] pyVmomi not available; push updates disabled')
+            return
+        def _on_event(ev):
+            if ev.get('kind') == 'resync':
+                self._remember_moids(ev.get('host'), ev.get('vms') or [])
+            elif ev.get('kind') == 'delta':
+                self._remember_moids(ev.get('host'), ev.get('vms') or [], ev.get('removed') or [])
+            on_event(ev)
+
+        for s in servers:
+            w = HostWatcher(self.watch_sessions, s, _on_event)
+            w.start()
+            self._watchers.append(w)
+        logging.info(f'[INV] Push updates: watching {len(self._watchers)} host(s)')
+
+    def stop_watching(self):
+        watchers, self._watchers = self._watchers, []
+        for w in watchers:
+            w.stop()
+
+    def is_watching(self):
+        return bool(self._watchers)
 
     def fetch_inventory(self, servers):
         vms = []
@@ -30,87 +164,64 @@ class ESXiClient:
         if not SmartConnect or not vim:
             logging.info('[INV] pyVmomi not available')
             return vms
-        for s in servers:
+
+        def _one(s):
             host = s.get('host')
-            user = s.get('username')
-            pwd = s.get('password')
-            try:
-                logging.info(f'[INV] Connecting to {host} ...')
-                ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-                ctx.check_hostname = False
-                ctx.verify_mode = ssl.CERT_NONE
-                si = SmartConnect(host=host, user=user, pwd=pwd, sslContext=ctx)
-                content = si.RetrieveContent()
-                view = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-                seen = []
-                for vm in view.view:
-                    try:
-                        state = str(vm.runtime.powerState)
-                        if self.show_running_only and state.lower() != 'poweredon':
-                            continue
-                        name = vm.name
-                        uuid = getattr(vm.config, 'uuid', '') if getattr(vm, 'config', None) else ''
-                        mid = getattr(vm, '_moId', None)
-                        if not mid and hasattr(vm, '_GetMoId'):
-                            try:
-                                mid = vm._GetMoId()
-                            except Exception:
-                                mid = None
-                        # Gather lightweight resource metrics from summary/quickStats
-                        cpu_mhz = None
-                        mem_mb = None
-                        disk_gb = None
-                        try:
-                            summary = getattr(vm, 'summary', None)
-                            if summary is not None:
-                                qs = getattr(summary, 'quickStats', None)
-                                if qs is not None:
-                                    cpu_mhz = getattr(qs, 'overallCpuUsage', None)
-                                    # Prefer guestMemoryUsage (MB); fallback to hostMemoryUsage
-                                    mem_mb = getattr(qs, 'guestMemoryUsage', None)
-                                    if mem_mb in (None, 0):
-                                        mem_mb = getattr(qs, 'hostMemoryUsage', None)
-                                storage = getattr(summary, 'storage', None)
-                                if storage is not None:
-                                    committed = getattr(storage, 'committed', None)
-                                    if committed is not None:
-                                        try:
-                                            disk_gb = round(float(committed) / (1024**3), 2)
-                                        except Exception:
-                                            disk_gb = None
-                        except Exception as e:
-                            logging.info(f'[INV] metrics parse error: {e}')
-                            traceback.print_exc()
-                        server_label = s.get('name') or host
-                        server_color = s.get('color') or None
-                        v = {
-                            'server': host,
-                            'server_label': server_label,
-                            'server_color': server_color,
-                            'name': name,
-                            'uuid': uuid,
-                            'moid': mid,
-                            'power_state': state,
-                            'res': {
-                                'cpu_mhz': cpu_mhz if cpu_mhz is not None else 0,
-                                'mem_mb': mem_mb if mem_mb is not None else 0,
-                                'disk_gb': disk_gb if disk_gb is not None else 0.0
-                            }
-                        }
-                        seen.append(v)
-                    except Exception as e:
-                        logging.info(f'[INV] vm parse error: {e}')
-                        traceback.print_exc()
+            logging.info(f'[INV] Reading inventory from {host} ...')
+            seen = self.sessions.call(host, s.get('username'), s.get('password'), lambda si: self._read_vms(si, s))
+            self._remember_moids(host, seen, replace=True)
+            logging.info(f'[INV] {host}: {len(seen)} VM(s) retrieved successfully.')
+            return seen
+
+        results, self.last_failed_hosts = self._for_each_host(servers, _one, 'INV')
+        for seen in results:
+            if seen:
                 vms.extend(seen)
-                view.Destroy()
-                Disconnect(si)
-                logging.info(f'[INV] {host}: {len(seen)} VM(s) retrieved successfully.')
-            except Exception as e:
-                logging.info(f'[INV] error {host}: {e}')
-                traceback.print_exc()
+        if self.last_failed_hosts:
+            logging.warning(f'[INV] Failed hosts: {", ".join(sorted(self.last_failed_hosts))}')
         logging.info('[INV] All servers processed. Now rebuilding UI elements.')
         return vms
 
+    def _remember_moids(self, host, vms, removed=(), replace=False):
+        # Moids from a recent read are trusted by launch_vmrc without another round trip
+        prev = set() if replace else set(self._known_moids.get(host, (frozenset(), 0.0))[0])
+        prev.update(v.get('moid') for v in vms if v.get('moid'))
+        prev.difference_update(removed)
+        self._known_moids[host] = (frozenset(prev), time.monotonic())
+
+    def is_known_moid(self, host, moid):
+        entry = self._known_moids.get(host)
+        if not entry or not moid:
+            return False
+        moids, ts = entry
+        return moid in moids and time.monotonic() - ts <= self.known_moid_ttl
+
+    def _read_vms(self, si, s):
+        host = s.get('host')
+        with perf.timed('retrieve', host):
+            vm_props = retrieve_properties(si, {vim.VirtualMachine: VM_PROPERTIES}, host=host)
+        with perf.timed('parse', host):
+            return self._vm_records(s, vm_props)
+
+    def _vm_records(self, s, vm_props, show_running_only=None):
+        if show_running_only is None:
+            show_running_only = self.show_running_only
+        seen = []
+        skipped = 0
+        for mor, props in vm_props:
+            try:
+                state = str(props.get('runtime.powerState', ''))
+                if show_running_only and state.lower() != 'poweredon':
+                    skipped += 1
+                    continue
+                seen.append(build_vm_record(s, mor, props))
+            except Exception as e:
+                logging.info(f'[INV] vm parse error: {e}')
+                traceback.print_exc()
+        if tracing.enabled('INV'):
+            logging.debug(f"[INV] {s.get('host')}: {len(seen)} VM record(s), {skipped} powered off and hidden")
+        return seen
+
     @staticmethod
     def build_vmrc_url_mks(ra_host: str, websocket: str, mksticket: str, thumbprint: str | None, vmx_path: str) -> str:
         """Build MKS VMRC URL as specified by VMRC: vmrc://<host>/?websocket=...&mksticket=...&thumbprint=...&path=<vmx>"""
@@ -120,42 +231,43 @@ class ESXiClient:
         base += f"&path={quote(vmx_path)}"
         return base
 
-    def launch_vmrc(self, host, moid, vmrc_path='', creds=None):
+    def launch_vmrc(self, host, moid, vmrc_path='', creds=None, instance_uuid=None):
         """Follow user's requested flow: AcquireCloneTicket and authority URL.
         Steps:
-          1) Connect with pyVmomi
+          1) Reuse the pooled session for the host (pyVmomi)
           2) ticket = si.content.sessionManager.AcquireCloneTicket()
           3) vmrc_url = f"vmrc://clone:{ticket}@{host}/?moid={vm_moid}"
-          4) Launch VMRC via registry handler or vmrc_path
+          4) Launch VMRC via vmrc_path or the cached registry handler
+        The moid is only re-checked against the host when it was not seen in a recent
+        inventory read, so a warm click costs a single SOAP call.
         """
         if not creds or not SmartConnect:
             logging.error('[VMRC] Missing credentials or pyVmomi not available; cannot acquire clone ticket')
             return False
         username = creds.get('username')
         password = creds.get('password')
-        # Ensure we have a valid moid string (try to refresh)
-        try:
-            moid = self.lookup_vm_moid(host, username or '', password or '', moid)
-        except Exception:
-            pass
+        t0 = time.monotonic()
+        stages = []
+
+        def _stage(name, since):
+            now = time.monotonic()
+            stages.append(f'{name}={(now - since) * 1000:.0f}ms')
+            return now
+
+        t = t0
+        if not self.is_known_moid(host, moid):
+            # Not in the recent index; make sure the moid still resolves (or re-resolve it)
+            moid = self.lookup_vm_moid(host, username or '', password or '', moid, instance_uuid)
+            t = _stage('resolve', t)
         ticket = None
         try:
-            logging.info(f"[VMRC] Connecting to {host} to acquire clone ticket ...")
-            ctx = ssl._create_unverified_context()
-            si = SmartConnect(host=host, user=username, pwd=password, sslContext=ctx)
-            try:
-                sm = si.RetrieveContent().sessionManager
-                ticket = sm.AcquireCloneTicket()
-                logging.info(f"[VMRC] Clone ticket: {ticket}")
-            finally:
-                try:
-                    Disconnect(si)
-                except Exception:
-                    pass
+            ticket = self.sessions.call(host, username, password, lambda si: si.RetrieveContent().sessionManager.AcquireCloneTicket())
+            perf.count('AcquireCloneTicket', host=host)
         except Exception as e:
             logging.error(f"[VMRC] Failed to acquire clone ticket: {e}")
             traceback.print_exc()
             return False
+        t = _stage('ticket', t)
 
         if not ticket:
             logging.error('[VMRC] Empty clone ticket; aborting')
@@ -163,55 +275,68 @@ class ESXiClient:
 
         # Build URL per user's instruction (authority form with moid)
         url_to_launch = f"vmrc://clone:{ticket}@{host}/?moid={moid}"
-        alt_url = f"vmware-vmrc://clone:{ticket}@{host}/?moid={moid}"
-        logging.info(f"[VMRC] Authority URL: {url_to_launch}")
-        logging.info(f"[VMRC] Alt URL:       {alt_url}")
+        logging.debug(f"[VMRC] Authority URL: vmrc://clone:***@{host}/?moid={moid}")
+
+        ok = self._launch_url(url_to_launch, vmrc_path)
+        _stage('launch', t)
+        logging.info(f"[VMRC] {host} moid={moid}: {'launched' if ok else 'launch failed'} in "
+                     f"{(time.monotonic() - t0) * 1000:.0f}ms ({' '.join(stages)})")
+        return ok
 
-        # Launch
+    def _launch_url(self, url, vmrc_path=''):
         if vmrc_path:
             try:
-                subprocess.Popen([vmrc_path, url_to_launch])
+                subprocess.Popen([vmrc_path, url])
                 return True
-            except Exception:
-                pass
-        # Try registry protocol handlers
-        if self._launch_via_registry(url_to_launch):
-            return True
-        # Try alt scheme
-        if self._launch_via_registry(alt_url):
+            except Exception as e:
+                logging.info(f"[VMRC] vmrc_path launch failed: {e}")
+        # Try registry protocol handler
+        if self._launch_via_registry(url):
             return True
         # Fallbacks
         try:
-            os.startfile(url_to_launch)
+            os.startfile(url)
             return True
         except Exception:
             try:
-                subprocess.Popen(['cmd', '/c', 'start', '', url_to_launch], shell=True)
+                subprocess.Popen(['cmd', '/c', 'start', '', url], shell=True)
                 return True
             except Exception:
                 return False
 
-    def _launch_via_registry(self, url: str) -> bool:
+    def _resolve_vmrc_handler(self):
+        """Shell command registered for vmrc:// (or vmware-vmrc://), looked up once per run."""
+        if self._vmrc_handler is not None:
+            return self._vmrc_handler or None
+        self._vmrc_handler = False
         if platform.system() != 'Windows' or winreg is None:
+            return None
+        for subkey in (r'vmrc\shell\open\command', r'vmware-vmrc\shell\open\command'):
+            try:
+                with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, subkey) as k:
+                    cmd, _ = winreg.QueryValueEx(k, None)
+            except Exception:
+                continue
+            if cmd:
+                logging.info(f"[VMRC] Protocol handler ({subkey}): {cmd}")
+                self._vmrc_handler = cmd
+                break
+        return self._vmrc_handler or None
+
+    def _launch_via_registry(self, url: str) -> bool:
+        cmd = self._resolve_vmrc_handler()
+        if not cmd:
             return False
-        keys = [r'vmrc\shell\open\command', r'vmware-vmrc\shell\open\command']
         try:
-            for subkey in keys:
-                try:
-                    with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, subkey) as k:
-                        cmd, _ = winreg.QueryValueEx(k, None)
-                        if not cmd:
-                            continue
-                        # Replace placeholder and run via shell to honor quoting
-                        cmdline = cmd.replace('%1', url).replace('%L', url)
-                        logging.info(f"[VMRC] Launch via registry: {cmdline}")
-                        subprocess.Popen(cmdline, shell=True)
-                        return True
-                except Exception:
-                    continue
+            # Replace placeholder and run via shell to honor quoting
+            cmdline = cmd.replace('%1', url).replace('%L', url)
+            subprocess.Popen(cmdline, shell=True)
+            return True
         except Exception as e:
             logging.error(f"[VMRC] Registry launch failed: {e}")
-        return False
+            # Handler may have been reinstalled or removed; look it up again next time
+            self._vmrc_handler = None
+            return False
 
     @staticmethod
     def get_host_thumbprint(host: str, port: int = 443) -> str:
@@ -221,298 +346,174 @@ class ESXiClient:
         sha1 = hashlib.sha1(der).hexdigest().upper()
         return ':'.join(sha1[i:i+2] for i in range(0, len(sha1), 2))
 
-    def lookup_vm_moid(self, host: str, username: str, password: str, moid_hint: str | None):
-        """Fetch latest moid string from ESXi host; prefer exact moRef id if present, otherwise fallback to original hint."""
+    def lookup_vm_moid(self, host: str, username: str, password: str, moid_hint: str | None, instance_uuid: str | None = None):
+        """Check the moid still names a VM on the host; re-resolve it from instanceUuid if it went stale."""
         if not SmartConnect:
             return moid_hint
+        def _lookup(si):
+            vm = self._find_vm(si, moid_hint, instance_uuid, verify=True)
+            return moid_of(vm) if vm is not None else moid_hint
         try:
-            ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
-            si = SmartConnect(host=host, user=username, pwd=password, sslContext=ctx)
-            try:
-                content = si.RetrieveContent()
-                view = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-                for vm in view.view:
-                    mid = getattr(vm, '_moId', None)
-                    if not mid and hasattr(vm, '_GetMoId'):
-                        try:
-                            mid = vm._GetMoId()
-                        except Exception:
-                            mid = None
-                    if mid and (str(mid) == str(moid_hint) or str(mid).endswith(str(moid_hint))):
-                        return str(mid)
-                return moid_hint
-            finally:
-                try:
-                    Disconnect(si)
-                except Exception:
-                    pass
+            return self.sessions.call(host, username, password, _lookup)
         except Exception:
             return moid_hint
 
-    def shutdown_guest(self, server, username, password, moid) -> bool:
+    def shutdown_guest(self, server, username, password, moid, instance_uuid=None) -> bool:
         if not SmartConnect or not vim:
             return False
         try:
-            ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
-            si = SmartConnect(host=server, user=username, pwd=password, sslContext=ctx)
-            content = si.RetrieveContent()
-            view = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-            target = None
-            for vm in view.view:
-                mid = getattr(vm, '_moId', None)
-                if not mid and hasattr(vm, '_GetMoId'):
-                    try:
-                        mid = vm._GetMoId()
-                    except Exception:
-                        mid = None
-                if str(mid) == str(moid):
-                    target = vm
-                    break
-            ok = False
-            if target:
-                try:
-                    logging.info(f"[GUEST] ShutdownGuest for moid={moid}")
-                    target.ShutdownGuest()
-                    ok = True
-                except Exception as e:
-                    logging.warning(f"[GUEST] ShutdownGuest failed: {type(e).__name__}: {e}")
-            view.Destroy()
-            Disconnect(si)
-            return ok
+            def _op(vm):
+                logging.info(f"[GUEST] ShutdownGuest for moid={moid_of(vm)}")
+                vm.ShutdownGuest()
+            return self.sessions.call(server, username, password, lambda si: self._invoke_on_vm(si, moid, instance_uuid, _op, 'GUEST'))
         except Exception as e:
             logging.error(f"[GUEST] shutdown_guest error: {type(e).__name__}: {e}")
             traceback.print_exc()
             return False
 
-    def reboot_guest(self, server, username, password, moid) -> bool:
+    def reboot_guest(self, server, username, password, moid, instance_uuid=None) -> bool:
         if not SmartConnect or not vim:
             return False
         try:
-            ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
-            si = SmartConnect(host=server, user=username, pwd=password, sslContext=ctx)
-            content = si.RetrieveContent()
-            view = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-            target = None
-            for vm in view.view:
-                mid = getattr(vm, '_moId', None)
-                if not mid and hasattr(vm, '_GetMoId'):
-                    try:
-                        mid = vm._GetMoId()
-                    except Exception:
-                        mid = None
-                if str(mid) == str(moid):
-                    target = vm
-                    break
-            ok = False
-            if target:
-                try:
-                    logging.info(f"[GUEST] RebootGuest for moid={moid}")
-                    target.RebootGuest()
-                    ok = True
-                except Exception as e:
-                    logging.warning(f"[GUEST] RebootGuest failed: {type(e).__name__}: {e}")
-            view.Destroy()
-            Disconnect(si)
-            return ok
+            def _op(vm):
+                logging.info(f"[GUEST] RebootGuest for moid={moid_of(vm)}")
+                vm.RebootGuest()
+            return self.sessions.call(server, username, password, lambda si: self._invoke_on_vm(si, moid, instance_uuid, _op, 'GUEST'))
         except Exception as e:
             logging.error(f"[GUEST] reboot_guest error: {type(e).__name__}: {e}")
             traceback.print_exc()
             return False
 
+    def _find_vm(self, si, moid, instance_uuid=None, verify=False):
+        """Bind straight to the VM from its moid, without scanning the inventory.
+
+        Binding is free; with verify=True one property read confirms the moid still
+        exists. A stale or missing moid falls back to SearchIndex.FindByUuid on the
+        VM's instanceUuid. Returns None when neither resolves.
+        """
+        if moid:
+            vm = vim.VirtualMachine(str(moid), si._stub)
+            if not verify:
+                return vm
+            try:
+                _ = vm.name
+                return vm
+            except vmodl.fault.ManagedObjectNotFound:
+                logging.info(f"[VM] moid {moid} no longer exists on host")
+        return self._find_vm_by_uuid(si, instance_uuid)
+
+    def _find_vm_by_uuid(self, si, instance_uuid):
+        if not instance_uuid:
+            return None
+        vm = si.RetrieveContent().searchIndex.FindByUuid(None, instance_uuid, True, True)
+        if vm is not None:
+            logging.info(f"[VM] instanceUuid {instance_uuid} resolved to moid={moid_of(vm)}")
+        return vm
+
+    def _invoke_on_vm(self, si, moid, instance_uuid, op, tag):
+        """Run op(vm) on the directly bound VM, retrying once through instanceUuid if the moid is stale.
+
+        Returns True when op completed, False when the VM could not be found or op raised.
+        Session-loss errors propagate so SessionPool.call can log in again and retry.
+        """
+        target = self._find_vm(si, moid)
+        if target is not None:
+            try:
+                op(target)
+                return True
+            except vmodl.fault.ManagedObjectNotFound:
+                logging.info(f"[{tag}] moid {moid} not found; retrying by instanceUuid")
+            except session_lost_errors():
+                # Let SessionPool.call reconnect and retry
+                raise
+            except Exception as e:
+                logging.warning(f"[{tag}] operation failed for moid={moid}: {type(e).__name__}: {e}")
+                return False
+        target = self._find_vm_by_uuid(si, instance_uuid)
+        if target is None:
+            logging.warning(f"[{tag}] VM not found: moid={moid} instanceUuid={instance_uuid}")
+            return False
+        try:
+            op(target)
+            return True
+        except session_lost_errors():
+            raise
+        except Exception as e:
+            logging.warning(f"[{tag}] operation failed for moid={moid_of(target)}: {type(e).__name__}: {e}")
+            return False
+
     def fetch_hosts_metrics(self, servers):
         metrics = []
         if not SmartConnect or not vim:
             return metrics
-        for s in servers:
-            host = s.get('host')
-            user = s.get('username')
-            pwd = s.get('password')
-            label = s.get('name') or host
-            color = s.get('color') or None
-            try:
-                ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-                ctx.check_hostname = False
-                ctx.verify_mode = ssl.CERT_NONE
-                si = SmartConnect(host=host, user=user, pwd=pwd, sslContext=ctx)
-                content = si.RetrieveContent()
-                # HostSystem view
-                hv = content.viewManager.CreateContainerView(content.rootFolder, [vim.HostSystem], True)
-                cpu_pct = None
-                mem_pct = None
-                disk_free_pct = None
-                vms_on = 0
-                vms_off = 0
-                target_host_id = None
-                try:
-                    for hs in hv.view:
-                        try:
-                            summ = getattr(hs, 'summary', None)
-                            if summ is None:
-                                continue
-                            try:
-                                target_host_id = getattr(hs, '_moId', None)
-                            except Exception:
-                                target_host_id = None
-                            hw = getattr(summ, 'hardware', None)
-                            qs = getattr(summ, 'quickStats', None)
-                            # CPU
-                            if hw is not None and qs is not None:
-                                mhz_per_core = getattr(hw, 'cpuMhz', None)
-                                cores = getattr(hw, 'numCpuCores', None)
-                                used_mhz = getattr(qs, 'overallCpuUsage', None)
-                                if mhz_per_core and cores and used_mhz is not None and mhz_per_core > 0:
-                                    cap_mhz = float(mhz_per_core) * float(cores)
-                                    cpu_pct = max(0.0, min(100.0, (float(used_mhz) / cap_mhz) * 100.0))
-                            # Memory
-                            total_mem_b = getattr(hw, 'memorySize', None) if hw is not None else None
-                            used_mem_mb = getattr(qs, 'overallMemoryUsage', None) if qs is not None else None
-                            if total_mem_b and used_mem_mb is not None and total_mem_b > 0:
-                                total_mem_mb = float(total_mem_b) / (1024.0 * 1024.0)
-                                mem_pct = max(0.0, min(100.0, (float(used_mem_mb) / total_mem_mb) * 100.0))
-                            break
-                        except Exception:
-                            continue
-                finally:
-                    try:
-                        hv.Destroy()
-                    except Exception:
-                        pass
-                # Count VMs powered on/off (filter to this host if possible)
-                vv = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-                try:
-                    for vm in vv.view:
-                        try:
-                            rt = getattr(vm, 'runtime', None)
-                            if rt is None:
-                                continue
-                            if target_host_id is not None:
-                                try:
-                                    hmor = getattr(rt, 'host', None)
-                                    vm_host_id = getattr(hmor, '_moId', None)
-                                    if vm_host_id and vm_host_id != target_host_id:
-                                        continue
-                                except Exception:
-                                    pass
-                            pwr = getattr(rt, 'powerState', None)
-                            if str(pwr).lower() == 'poweredon':
-                                vms_on += 1
-                            elif str(pwr).lower() == 'poweredoff':
-                                vms_off += 1
-                        except Exception:
-                            continue
-                finally:
-                    try:
-                        vv.Destroy()
-                    except Exception:
-                        pass
-                # Datastore free % across all datastores
-                dv = content.viewManager.CreateContainerView(content.rootFolder, [vim.Datastore], True)
-                try:
-                    total_capacity = 0
-                    total_free = 0
-                    for ds in dv.view:
-                        try:
-                            summ = getattr(ds, 'summary', None)
-                            if summ is None:
-                                continue
-                            cap = getattr(summ, 'capacity', None)
-                            free = getattr(summ, 'freeSpace', None)
-                            if cap and free is not None:
-                                total_capacity += int(cap)
-                                total_free += int(free)
-                        except Exception:
-                            continue
-                    if total_capacity > 0:
-                        disk_free_pct = max(0.0, min(100.0, (float(total_free) / float(total_capacity)) * 100.0))
-                finally:
-                    try:
-                        dv.Destroy()
-                    except Exception:
-                        pass
-                Disconnect(si)
-                metrics.append({
-                    'host': host,
-                    'label': label,
-                    'color': color,
-                    'cpu_pct': round(cpu_pct if cpu_pct is not None else 0.0, 2),
-                    'mem_pct': round(mem_pct if mem_pct is not None else 0.0, 2),
-                    'disk_free_pct': round(disk_free_pct if disk_free_pct is not None else 0.0, 2),
-                    'vms_on': int(vms_on),
-                    'vms_off': int(vms_off)
-                })
-            except Exception as e:
-                logging.info(f'[MET] error {host}: {e}')
-                traceback.print_exc()
+
+        def _one(s):
+            return self.sessions.call(s.get('host'), s.get('username'), s.get('password'), lambda si: self._read_host(si, s, with_vms=False)[1])
+
+        results, _failed = self._for_each_host(servers, _one, 'MET')
+        metrics = [m for m in results if m is not None]
         return metrics
 
-    def power_on(self, server, username, password, moid):
+    def fetch_inventory_and_metrics(self, servers, show_running_only=None):
+        """Single pass per host: VM records and host gauges from one PropertyCollector call.
+
+        Returns (vms, host_metrics) with the same dict shapes as fetch_inventory and
+        fetch_hosts_metrics. Power counts cover every VM even when show_running_only
+        filters the VM list. show_running_only defaults to the client's attribute; callers
+        on worker threads pass it from their config snapshot.
+        """
+        vms = []
+        metrics = []
+        logging.info('[INV] refresh (inventory + metrics) start')
+        if not SmartConnect or not vim:
+            logging.info('[INV] pyVmomi not available')
+            return vms, metrics
+
+        def _one(s):
+            host = s.get('host')
+            logging.info(f'[INV] Reading {host} ...')
+            seen, m = self.sessions.call(host, s.get('username'), s.get('password'), lambda si: self._read_host(si, s, show_running_only=show_running_only))
+            self._remember_moids(host, seen, replace=True)
+            logging.info(f'[INV] {host}: {len(seen)} VM(s) retrieved successfully.')
+            return seen, m
+
+        results, self.last_failed_hosts = self._for_each_host(servers, _one, 'INV')
+        for r in results:
+            if r is None:
+                continue
+            vms.extend(r[0])
+            metrics.append(r[1])
+        if self.last_failed_hosts:
+            logging.warning(f'[INV] Failed hosts: {", ".join(sorted(self.last_failed_hosts))}')
+        logging.info('[INV] All servers processed. Now rebuilding UI elements.')
+        return vms, metrics
+
+    def _read_host(self, si, s, with_vms=True, show_running_only=None):
+        host = s.get('host')
+        with perf.timed('retrieve', host):
+            vm_props, hosts, datastores = split_by_type(retrieve_properties(si, host_specs(with_vms), host=host))
+        with perf.timed('metrics', host):
+            metrics = build_host_metrics(s, vm_props, hosts, datastores)
+        seen = []
+        if with_vms:
+            with perf.timed('parse', host):
+                seen = self._vm_records(s, vm_props, show_running_only)
+        return seen, metrics
+
+    def power_on(self, server, username, password, moid, instance_uuid=None):
         if not SmartConnect or not vim:
             return False
         try:
-            ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
-            si = SmartConnect(host=server, user=username, pwd=password, sslContext=ctx)
-            content = si.RetrieveContent()
-            view = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-            target = None
-            for vm in view.view:
-                mid = getattr(vm, '_moId', None)
-                if not mid and hasattr(vm, '_GetMoId'):
-                    try:
-                        mid = vm._GetMoId()
-                    except Exception:
-                        mid = None
-                if str(mid) == str(moid):
-                    target = vm
-                    break
-            if target:
-                try:
-                    target.PowerOnVM_Task()
-                except Exception:
-                    traceback.print_exc()
-            view.Destroy()
-            Disconnect(si)
-            return target is not None
+            return self.sessions.call(server, username, password, lambda si: self._invoke_on_vm(si, moid, instance_uuid, lambda vm: vm.PowerOnVM_Task(), 'POWER'))
         except Exception:
             traceback.print_exc()
             return False
 
-    def power_off(self, server, username, password, moid):
+    def power_off(self, server, username, password, moid, instance_uuid=None):
         if not SmartConnect or not vim:
             return False
         try:
-            ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
-            si = SmartConnect(host=server, user=username, pwd=password, sslContext=ctx)
-            content = si.RetrieveContent()
-            view = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-            target = None
-            for vm in view.view:
-                mid = getattr(vm, '_moId', None)
-                if not mid and hasattr(vm, '_GetMoId'):
-                    try:
-                        mid = vm._GetMoId()
-                    except Exception:
-                        mid = None
-                if str(mid) == str(moid):
-                    target = vm
-                    break
-            if target:
-                try:
-                    target.PowerOffVM_Task()
-                except Exception:
-                    traceback.print_exc()
-            view.Destroy()
-            Disconnect(si)
-            return target is not None
+            return self.sessions.call(server, username, password, lambda si: self._invoke_on_vm(si, moid, instance_uuid, lambda vm: vm.PowerOffVM_Task(), 'POWER'))
         except Exception:
             traceback.print_exc()
             return False
@@ -0,0 +1,217 @@
+import logging
+
+from . import perf
+
+try:
+    from pyVmomi import vim, vmodl
+except Exception:
+    vim = None
+    vmodl = None
+
+
+# Property paths read for every VM; everything the VM card and resource chip need
+VM_PROPERTIES = (
+    'name',
+    'runtime.powerState',
+    'config.uuid',
+    'config.instanceUuid',
+    'summary.quickStats.overallCpuUsage',
+    'summary.quickStats.guestMemoryUsage',
+    'summary.quickStats.hostMemoryUsage',
+    'summary.storage.committed',
+)
+
+# Host gauges: first HostSystem summary, VM power counts on that host, datastore totals
+HOST_PROPERTIES = (
+    'summary.hardware.cpuMhz',
+    'summary.hardware.numCpuCores',
+    'summary.hardware.memorySize',
+    'summary.quickStats.overallCpuUsage',
+    'summary.quickStats.overallMemoryUsage',
+)
+
+VM_COUNT_PROPERTIES = (
+    'runtime.powerState',
+    'runtime.host',
+)
+
+DATASTORE_PROPERTIES = (
+    'summary.capacity',
+    'summary.freeSpace',
+)
+
+PAGE_SIZE = 1000
+
+
+def container_filter_spec(view, specs):
+    """FilterSpec selecting the given property paths on every object reachable through view."""
+    PC = vmodl.query.PropertyCollector
+    traversal = PC.TraversalSpec(name='traverseView', path='view', skip=False, type=vim.view.ContainerView)
+    obj_spec = PC.ObjectSpec(obj=view, skip=True, selectSet=[traversal])
+    prop_specs = [PC.PropertySpec(type=t, pathSet=list(paths), all=False) for t, paths in specs.items()]
+    return PC.FilterSpec(objectSet=[obj_spec], propSet=prop_specs)
+
+
+def retrieve_properties(si, specs, page_size=PAGE_SIZE, host=None):
+    """Read property paths for every object of the given types in one PropertyCollector pass.
+
+    specs maps a managed object type (e.g. vim.VirtualMachine) to the property paths wanted
+    for it. A single ContainerView over the root folder is traversed, so the whole host is
+    read with one RetrievePropertiesEx call plus one ContinueRetrievePropertiesEx per page,
+    instead of one SOAP round trip per attribute access.
+
+    Returns a list of (moref, {path: value}) tuples. Paths that are unset on an object
+    (e.g. config on an inaccessible VM) are simply absent from its dict. host only labels
+    the API call counters.
+    """
+    PC = vmodl.query.PropertyCollector
+    content = si.RetrieveContent()
+    view = content.viewManager.CreateContainerView(content.rootFolder, list(specs.keys()), True)
+    try:
+        pc = content.propertyCollector
+        result = pc.RetrievePropertiesEx([container_filter_spec(view, specs)], PC.RetrieveOptions(maxObjects=page_size))
+        perf.count('RetrievePropertiesEx', host=host)
+        out = []
+        pages = 0
+        while result is not None:
+            pages += 1
+            for oc in (result.objects or []):
+                out.append((oc.obj, {p.name: p.val for p in (oc.propSet or [])}))
+            if not result.token:
+                break
+            result = pc.ContinueRetrievePropertiesEx(result.token)
+            perf.count('ContinueRetrievePropertiesEx', host=host)
+        logging.debug(f'[INV] PropertyCollector: {len(out)} object(s) in {pages} page(s)')
+        return out
+    finally:
+        try:
+            view.Destroy()
+        except Exception:
+            pass
+
+
+def moid_of(mor):
+    mid = getattr(mor, '_moId', None)
+    if not mid and hasattr(mor, '_GetMoId'):
+        try:
+            mid = mor._GetMoId()
+        except Exception:
+            mid = None
+    return mid
+
+
+def build_vm_record(s, mor, props):
+    """Turn one VirtualMachine property set into the VM dict used by the UI."""
+    host = s.get('host')
+    cpu_mhz = props.get('summary.quickStats.overallCpuUsage')
+    # Prefer guestMemoryUsage (MB); fallback to hostMemoryUsage
+    mem_mb = props.get('summary.quickStats.guestMemoryUsage')
+    if mem_mb in (None, 0):
+        mem_mb = props.get('summary.quickStats.hostMemoryUsage')
+    disk_gb = None
+    committed = props.get('summary.storage.committed')
+    if committed is not None:
+        try:
+            disk_gb = round(float(committed) / (1024**3), 2)
+        except Exception:
+            disk_gb = None
+    return {
+        'server': host,
+        'server_label': s.get('name') or host,
+        'server_color': s.get('color') or None,
+        'name': props.get('name', ''),
+        'uuid': props.get('config.uuid') or '',
+        'instance_uuid': props.get('config.instanceUuid') or '',
+        'moid': moid_of(mor),
+        'power_state': str(props.get('runtime.powerState', '')),
+        'res': {
+            'cpu_mhz': cpu_mhz if cpu_mhz is not None else 0,
+            'mem_mb': mem_mb if mem_mb is not None else 0,
+            'disk_gb': disk_gb if disk_gb is not None else 0.0
+        }
+    }
+
+
+def host_specs(with_vms=True):
+    """specs for one combined pass: VM records (or just power counts), host summary and datastores."""
+    vm_paths = tuple(dict.fromkeys(VM_PROPERTIES + VM_COUNT_PROPERTIES)) if with_vms else VM_COUNT_PROPERTIES
+    return {
+        vim.VirtualMachine: vm_paths,
+        vim.HostSystem: HOST_PROPERTIES,
+        vim.Datastore: DATASTORE_PROPERTIES,
+    }
+
+
+def split_by_type(objects):
+    """Group retrieve_properties() output into (vms, hosts, datastores) lists."""
+    vms, hosts, datastores = [], [], []
+    for mor, props in objects:
+        if isinstance(mor, vim.VirtualMachine):
+            vms.append((mor, props))
+        elif isinstance(mor, vim.HostSystem):
+            hosts.append((mor, props))
+        elif isinstance(mor, vim.Datastore):
+            datastores.append((mor, props))
+    return vms, hosts, datastores
+
+
+def build_host_metrics(s, vms, hosts, datastores):
+    """Compute the HostMetricsCard dict from one pass worth of property sets."""
+    host = s.get('host')
+    cpu_pct = None
+    mem_pct = None
+    disk_free_pct = None
+    target_host_id = None
+    for mor, props in hosts:
+        try:
+            target_host_id = moid_of(mor)
+            # CPU
+            mhz_per_core = props.get('summary.hardware.cpuMhz')
+            cores = props.get('summary.hardware.numCpuCores')
+            used_mhz = props.get('summary.quickStats.overallCpuUsage')
+            if mhz_per_core and cores and used_mhz is not None and mhz_per_core > 0:
+                cap_mhz = float(mhz_per_core) * float(cores)
+                cpu_pct = max(0.0, min(100.0, (float(used_mhz) / cap_mhz) * 100.0))
+            # Memory
+            total_mem_b = props.get('summary.hardware.memorySize')
+            used_mem_mb = props.get('summary.quickStats.overallMemoryUsage')
+            if total_mem_b and used_mem_mb is not None and total_mem_b > 0:
+                total_mem_mb = float(total_mem_b) / (1024.0 * 1024.0)
+                mem_pct = max(0.0, min(100.0, (float(used_mem_mb) / total_mem_mb) * 100.0))
+            break
+        except Exception:
+            continue
+    # Count VMs powered on/off (filter to this host if possible)
+    vms_on = 0
+    vms_off = 0
+    for mor, props in vms:
+        if target_host_id is not None:
+            vm_host_id = moid_of(props.get('runtime.host'))
+            if vm_host_id and vm_host_id != target_host_id:
+                continue
+        pwr = str(props.get('runtime.powerState', '')).lower()
+        if pwr == 'poweredon':
+            vms_on += 1
+        elif pwr == 'poweredoff':
+            vms_off += 1
+    # Datastore free % across all datastores
+    total_capacity = 0
+    total_free = 0
+    for mor, props in datastores:
+        cap = props.get('summary.capacity')
+        free = props.get('summary.freeSpace')
+        if cap and free is not None:
+            total_capacity += int(cap)
+            total_free += int(free)
+    if total_capacity > 0:
+        disk_free_pct = max(0.0, min(100.0, (float(total_free) / float(total_capacity)) * 100.0))
+    return {
+        'host': host,
+        'label': s.get('name') or host,
+        'color': s.get('color') or None,
+        'cpu_pct': round(cpu_pct if cpu_pct is not None else 0.0, 2),
+        'mem_pct': round(mem_pct if mem_pct is not None else 0.0, 2),
+        'disk_free_pct': round(disk_free_pct if disk_free_pct is not None else 0.0, 2),
+        'vms_on': int(vms_on),
+        'vms_off': int(vms_off)
+    }
@@ -1,33 +1,160 @@
+import atexit
 import logging
+import logging.handlers
+import marshal
 import os
+import queue
+import zlib
 from collections import deque
 from datetime import datetime
 
+from . import perf, tracing, watchdog
+
 
 class LogBufferHandler(logging.Handler):
-    def __init__(self, capacity=5000):
+    """In-memory ring buffer behind the diagnostics bundle.
+
+    emit() keeps a compact raw tuple per record and does no formatting; every chunk_size
+    records the chunk is marshalled and zlib-compressed. Lines are formatted only when
+    get_text() runs (save_diagnostics). The oldest compressed chunks are dropped once the
+    buffer holds about capacity records.
+    """
+
+    def __init__(self, capacity=50000, chunk_size=1000):
         super().__init__()
-        self.buffer = deque(maxlen=capacity)
+        self.chunk_size = max(1, int(chunk_size))
+        self._hot = []
+        self._chunks = deque(maxlen=max(1, int(capacity) // self.chunk_size))
         self.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] [%(name)s] %(message)s', datefmt='%H:%M:%S'))
 
     def emit(self, record: logging.LogRecord):
         try:
-            msg = self.format(record)
-            self.buffer.append(msg)
+            exc_text = None
+            if record.exc_info:
+                # Tracebacks pin frames; render them now rather than keep the objects alive
+                exc_text = record.exc_text or self.formatter.formatException(record.exc_info)
+            self._hot.append((record.created, record.levelno, record.levelname, record.name,
+                              record.msg, record.args, exc_text))
+            if len(self._hot) >= self.chunk_size:
+                self._seal()
         except Exception:
             pass
 
+    def _seal(self):
+        # Resolve messages to plain strings so the chunk marshals; no timestamps or layout yet
+        rows = []
+        for created, levelno, levelname, name, msg, args, exc_text in self._hot:
+            rows.append((created, levelno, levelname, name, self._message(msg, args), exc_text))
+        self._chunks.append(zlib.compress(marshal.dumps(rows), 1))
+        self._hot = []
+
+    @staticmethod
+    def _message(msg, args):
+        msg = str(msg)
+        if args:
+            try:
+                msg = msg % args
+            except Exception:
+                msg = f'{msg} {args!r}'
+        return msg
+
+    def _format_row(self, created, levelno, levelname, name, message, exc_text):
+        rec = logging.makeLogRecord({
+            'created': created, 'msecs': (created - int(created)) * 1000, 'levelno': levelno,
+            'levelname': levelname, 'name': name, 'msg': message, 'args': None, 'exc_text': exc_text,
+        })
+        return self.format(rec)
+
     def get_text(self) -> str:
-        return '\n'.join(self.buffer)
+        self.acquire()
+        try:
+            chunks = list(self._chunks)
+            hot = list(self._hot)
+        finally:
+            self.release()
+        lines = []
+        for blob in chunks:
+            for row in marshal.loads(zlib.decompress(blob)):
+                lines.append(self._format_row(*row))
+        for created, levelno, levelname, name, msg, args, exc_text in hot:
+            lines.append(self._format_row(created, levelno, levelname, name, self._message(msg, args), exc_text))
+        return '\n'.join(lines)
 
 
 _log_buffer_handler = LogBufferHandler()
 
 
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues the record untouched; the listener thread does all formatting."""
+
+    def prepare(self, record):
+        # The stock prepare() formats for pickling to other processes; this queue never leaves the process
+        return record
+
+
+_log_queue = queue.SimpleQueue()
+_queue_handler = _InProcessQueueHandler(_log_queue)
+# Per-tag trace_levels, applied on the caller's thread before a record is queued
+_queue_handler.addFilter(tracing.TagLevelFilter())
+_listener = None
+
+
 def attach_to_root():
+    add_sink(_log_buffer_handler)
+
+
+def add_sink(handler):
+    """Send log records to handler; on the listener thread once start_queue_logging() has run."""
+    if _listener is not None:
+        if handler not in _listener.handlers:
+            # Swapped in whole, so the listener thread never sees a half-updated tuple
+            _listener.handlers = _listener.handlers + (handler,)
+        return
+    root = logging.getLogger()
+    if handler not in root.handlers:
+        root.addHandler(handler)
+
+
+def start_queue_logging():
+    """Move the root logger's sinks behind a queue drained by a background listener.
+
+    Logging calls on any thread (the GUI thread included) then cost an enqueue; stdout,
+    the diagnostics buffer and any file handlers run on the listener thread. Stopped (and
+    drained) at exit.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    root = logging.getLogger()
+    sinks = [h for h in root.handlers if h is not _queue_handler]
+    for h in sinks:
+        root.removeHandler(h)
+    _queue_handler.setLevel(logging.NOTSET)
+    root.addHandler(_queue_handler)
+    _listener = logging.handlers.QueueListener(_log_queue, *sinks, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_queue_logging)
+
+
+def stop_queue_logging():
+    """Flush queued records to the sinks and put them back on the root logger."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    listener.stop()
+    for h in listener.handlers:
+        root.addHandler(h)
+
+
+def _sink_handlers():
     root = logging.getLogger()
-    if _log_buffer_handler not in root.handlers:
-        root.addHandler(_log_buffer_handler)
+    handlers = list(root.handlers)
+    if _listener is not None:
+        handlers.extend(_listener.handlers)
+    return handlers
 
 
 def save_diagnostics(appdata_dir: str) -> str:
@@ -37,6 +164,10 @@ def save_diagnostics(appdata_dir: str) -> str:
     path = os.path.join(diag_dir, f'diagnostics_{ts}.log')
     with open(path, 'w', encoding='utf-8') as f:
         f.write(_log_buffer_handler.get_text())
+        f.write('\n\n')
+        f.write(perf.report_text())
+        f.write('\n\n')
+        f.write(watchdog.report_text())
         f.write('\n')
     return path
 
@@ -49,7 +180,7 @@ def set_debug_enabled(on: bool):
         level = logging.DEBUG
         root.setLevel(level)
         try:
-            for h in list(root.handlers):
+            for h in _sink_handlers():
                 h.setLevel(level)
         except Exception:
             pass
@@ -59,7 +190,7 @@ def set_debug_enabled(on: bool):
         level = logging.CRITICAL + 1
         root.setLevel(level)
         try:
-            for h in list(root.handlers):
+            for h in _sink_handlers():
                 h.setLevel(level)
         except Exception:
             pass
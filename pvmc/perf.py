@@ -0,0 +1,194 @@
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+# Samples kept per (phase, host); percentiles are over this rolling window
+WINDOW = 512
+
+# Phases of a refresh cycle, in the order they happen
+PHASES = ('connect', 'retrieve', 'parse', 'metrics', 'refresh', 'metrics_refresh', 'reconcile', 'layout', 'redock', 'stall')
+
+_lock = threading.Lock()
+_samples = {}
+_counters = {}
+# Bumped on every record()/count(), so viewers can skip redraws when nothing changed
+_version = 0
+
+
+def record(phase, ms, host=None):
+    """Add one duration (milliseconds) to phase's rolling window; host is None for app-wide phases."""
+    global _version
+    key = (phase, host or '')
+    with _lock:
+        q = _samples.get(key)
+        if q is None:
+            q = _samples[key] = deque(maxlen=WINDOW)
+        q.append(float(ms))
+        _version += 1
+
+
+@contextmanager
+def timed(phase, host=None):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase, (time.perf_counter() - t0) * 1000.0, host)
+
+
+def count(name, n=1, host=None):
+    """Bump an API call counter (e.g. 'RetrievePropertiesEx'), per host."""
+    global _version
+    key = (name, host or '')
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + n
+        _version += 1
+
+
+def version():
+    return _version
+
+
+def values(phase, host=None):
+    """The raw samples (ms, oldest first) currently in phase's window."""
+    with _lock:
+        return list(_samples.get((phase, host or ''), ()))
+
+
+def hosts(phase):
+    """Hosts with samples for phase ('' is the app-wide series)."""
+    with _lock:
+        return sorted(h for p, h in _samples if p == phase)
+
+
+def counter(name, host=None):
+    """Count for one host, or summed over all hosts when host is None."""
+    with _lock:
+        if host is not None:
+            return _counters.get((name, host), 0)
+        return sum(n for (k, _h), n in _counters.items() if k == name)
+
+
+def process_rss():
+    """Resident set size of this process in bytes, or None if it cannot be read here."""
+    if psutil is not None:
+        try:
+            return psutil.Process().memory_info().rss
+        except Exception:
+            pass
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class _PMC(ctypes.Structure):
+                _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                            ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                            ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+            pmc = _PMC()
+            pmc.cb = ctypes.sizeof(_PMC)
+            proc = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(proc, ctypes.byref(pmc), pmc.cb):
+                return int(pmc.WorkingSetSize)
+        except Exception:
+            return None
+        return None
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except Exception:
+        return None
+
+
+def _percentile(ordered, p):
+    if not ordered:
+        return 0.0
+    i = min(len(ordered) - 1, max(0, int(round(p / 100.0 * (len(ordered) - 1)))))
+    return ordered[i]
+
+
+def stats(phase, host=None):
+    """{n, last, p50, p95, p99, max} in ms for one phase (and host), or None if never recorded."""
+    with _lock:
+        q = _samples.get((phase, host or ''))
+        values = list(q) if q else None
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        'n': len(values), 'last': values[-1], 'p50': _percentile(ordered, 50),
+        'p95': _percentile(ordered, 95), 'p99': _percentile(ordered, 99), 'max': ordered[-1],
+    }
+
+
+def snapshot():
+    """Everything recorded so far: {'phases': {phase: {host: stats}}, 'counters': {name: {host: n}}}."""
+    with _lock:
+        keys = list(_samples)
+        counters = dict(_counters)
+    phases = {}
+    for phase, host in sorted(keys, key=lambda k: (_phase_order(k[0]), k[1])):
+        s = stats(phase, host)
+        if s:
+            phases.setdefault(phase, {})[host] = s
+    out_counters = {}
+    for (name, host), n in sorted(counters.items()):
+        out_counters.setdefault(name, {})[host] = n
+    return {'phases': phases, 'counters': out_counters}
+
+
+def _phase_order(phase):
+    return PHASES.index(phase) if phase in PHASES else len(PHASES)
+
+
+def report_text():
+    """Plain-text table of phase timings and API counts, for the diagnostics bundle."""
+    snap = snapshot()
+    lines = ['== Refresh phase timings (ms, rolling window of %d) ==' % WINDOW]
+    lines.append(f"{'phase':<10} {'host':<28} {'n':>5} {'last':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for phase, hosts in snap['phases'].items():
+        for host, s in hosts.items():
+            lines.append(f"{phase:<10} {host or '-':<28} {s['n']:>5} {s['last']:>9.1f} {s['p50']:>9.1f} "
+                         f"{s['p95']:>9.1f} {s['p99']:>9.1f} {s['max']:>9.1f}")
+    lines.append('')
+    lines.append('== API calls ==')
+    for name, hosts in snap['counters'].items():
+        for host, n in hosts.items():
+            lines.append(f"{name:<30} {host or '-':<28} {n:>8}")
+    return '\n'.join(lines)
+
+
+def summary_lines(phases=('refresh', 'reconcile', 'layout', 'redock')):
+    """Short 'phase: p50 / p95' lines (all hosts pooled) for tooltips."""
+    snap = snapshot()
+    out = []
+    for phase in phases:
+        hosts = snap['phases'].get(phase)
+        if not hosts:
+            continue
+        if len(hosts) == 1:
+            s = next(iter(hosts.values()))
+        else:
+            with _lock:
+                values = sorted(v for h in hosts for v in _samples.get((phase, h), ()))
+            s = {'n': len(values), 'p50': _percentile(values, 50), 'p95': _percentile(values, 95)}
+        out.append(f"{phase}: p50 {s['p50']:.0f} ms / p95 {s['p95']:.0f} ms (n={s['n']})")
+    return out
+
+
+def reset():
+    global _version
+    with _lock:
+        _samples.clear()
+        _counters.clear()
+        _version += 1
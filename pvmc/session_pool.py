@@ -0,0 +1,173 @@
+import logging
+import ssl
+import threading
+import time
+
+from . import perf
+
+try:
+    from pyVim.connect import SmartConnect, Disconnect
+    from pyVmomi import vim
+except Exception:
+    SmartConnect = None
+    Disconnect = None
+    vim = None
+
+
+def unverified_ssl_context():
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+
+def session_lost_errors():
+    # Errors that mean the session (not the request) is gone: expired login, or a connection
+    # reset or refused before the request was acted on. Timeouts are not included: the host
+    # may already have run the call, and retrying would repeat it (PowerOnVM_Task, ShutdownGuest).
+    errs = [ConnectionResetError, ConnectionRefusedError, ConnectionAbortedError, BrokenPipeError]
+    if vim is not None:
+        errs.append(vim.fault.NotAuthenticated)
+    return tuple(errs)
+
+
+class _Session:
+    def __init__(self, host, user, pwd):
+        self.host = host
+        self.user = user
+        self.pwd = pwd
+        self.si = None
+        self.lock = threading.Lock()
+        self.last_used = 0.0
+
+
+class SessionPool:
+    """Keeps one authenticated ServiceInstance per (host, user) alive across refreshes.
+
+    Sessions are created lazily on first use, pinged from a background thread so hostd
+    does not expire them, and transparently re-established when a call fails because
+    the session was dropped.
+    """
+
+    def __init__(self, keepalive_interval=300.0, idle_timeout=1800.0, http_timeout=60.0):
+        self.keepalive_interval = float(keepalive_interval)
+        self.idle_timeout = float(idle_timeout)
+        # Socket timeout per SOAP request so a dead host cannot pin a worker forever
+        self.http_timeout = http_timeout
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def acquire(self, host, user, pwd):
+        """Return a logged-in ServiceInstance for (host, user), connecting if needed."""
+        if not SmartConnect:
+            raise RuntimeError('pyVmomi not available')
+        key = (host, user)
+        with self._lock:
+            sess = self._sessions.get(key)
+            if sess is None:
+                sess = _Session(host, user, pwd)
+                self._sessions[key] = sess
+            # Touched under the pool lock so the idle sweep cannot evict a session being acquired
+            sess.last_used = time.monotonic()
+        with sess.lock:
+            if sess.si is not None and sess.pwd != pwd:
+                logging.info(f'[SESS] Credentials changed for {user}@{host}; reconnecting')
+                self._disconnect(sess)
+            sess.pwd = pwd
+            if sess.si is None:
+                logging.info(f'[SESS] Connecting to {host} as {user} ...')
+                perf.count('Login', host=host)
+                with perf.timed('connect', host):
+                    sess.si = SmartConnect(host=host, user=user, pwd=pwd, sslContext=unverified_ssl_context(),
+                                           httpConnectionTimeout=self.http_timeout)
+                logging.info(f'[SESS] Session established: {user}@{host}')
+            si = sess.si
+        self._ensure_keepalive()
+        return si
+
+    def call(self, host, user, pwd, fn):
+        """Run fn(si) on the pooled session, re-logging in once if the session has expired."""
+        si = self.acquire(host, user, pwd)
+        try:
+            return fn(si)
+        except session_lost_errors() as e:
+            logging.info(f'[SESS] Session for {user}@{host} lost ({type(e).__name__}); reconnecting')
+            self.invalidate(host, user)
+            si = self.acquire(host, user, pwd)
+            return fn(si)
+
+    def invalidate(self, host, user):
+        with self._lock:
+            sess = self._sessions.get((host, user))
+        if sess is None:
+            return
+        with sess.lock:
+            self._disconnect(sess)
+
+    def close(self):
+        """Stop keepalives and log out of every pooled session."""
+        self._stop.set()
+        t = self._thread
+        if t is not None and t.is_alive():
+            t.join(timeout=2.0)
+        self._thread = None
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for sess in sessions:
+            with sess.lock:
+                self._disconnect(sess)
+        logging.info(f'[SESS] Closed {len(sessions)} pooled session(s)')
+
+    def _disconnect(self, sess):
+        si = sess.si
+        sess.si = None
+        if si is None or not Disconnect:
+            return
+        try:
+            Disconnect(si)
+        except Exception:
+            pass
+
+    def _ensure_keepalive(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._keepalive_loop, name='pvmc-session-keepalive', daemon=True)
+            self._thread.start()
+
+    def _evict_if_idle(self, key, sess):
+        # Checked and removed under the pool lock, where acquire() touches last_used, so a session
+        # being handed out is never evicted; the logout itself is a network call and runs unlocked
+        with self._lock:
+            if self._sessions.get(key) is not sess or time.monotonic() - sess.last_used <= self.idle_timeout:
+                return False
+            del self._sessions[key]
+        logging.info(f'[SESS] Closing idle session {sess.user}@{sess.host}')
+        with sess.lock:
+            self._disconnect(sess)
+        return True
+
+    def _keepalive_loop(self):
+        while not self._stop.wait(self.keepalive_interval):
+            with self._lock:
+                sessions = list(self._sessions.items())
+            for key, sess in sessions:
+                if self._stop.is_set():
+                    return
+                if self._evict_if_idle(key, sess):
+                    continue
+                si = sess.si
+                if si is None:
+                    continue
+                try:
+                    si.CurrentTime()
+                except Exception as e:
+                    # Dropped here; the next acquire() logs in again
+                    logging.info(f'[SESS] Keepalive failed for {sess.user}@{sess.host}: {type(e).__name__}: {e}')
+                    with sess.lock:
+                        if sess.si is si:
+                            self._disconnect(sess)
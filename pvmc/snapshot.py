@@ -0,0 +1,59 @@
+import json
+import logging
+import os
+import time
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILE = 'inventory_snapshot.json'
+
+
+def snapshot_path(appdata_dir: str) -> str:
+    return os.path.join(appdata_dir, SNAPSHOT_FILE)
+
+
+def save_snapshot(appdata_dir: str, vms, host_metrics, failed_hosts=None) -> bool:
+    """Persist the last good inventory for the next launch's first paint.
+
+    Hosts listed in failed_hosts keep whatever the previous snapshot had for them, so one
+    unreachable host does not wipe its VMs from the warm start. Written compactly and
+    atomically (tmp + replace), like the config file.
+    """
+    vms = list(vms)
+    host_metrics = list(host_metrics)
+    if failed_hosts:
+        prev = load_snapshot(appdata_dir)
+        if prev:
+            vms.extend(v for v in prev.get('vms', []) if v.get('server') in failed_hosts)
+            host_metrics.extend(m for m in prev.get('host_metrics', []) if m.get('host') in failed_hosts)
+    data = {
+        'version': SNAPSHOT_VERSION,
+        'saved_at': time.time(),
+        'vms': [dict(v) for v in vms],
+        'host_metrics': [dict(m) for m in host_metrics],
+    }
+    path = snapshot_path(appdata_dir)
+    tmp = path + '.tmp'
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp, path)
+        return True
+    except Exception as e:
+        logging.info(f'[SNAP] save failed: {type(e).__name__}: {e}')
+        return False
+
+
+def load_snapshot(appdata_dir: str):
+    """Return {'saved_at', 'vms', 'host_metrics'} from the last snapshot, or None."""
+    path = snapshot_path(appdata_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != SNAPSHOT_VERSION:
+            return None
+        return data
+    except Exception as e:
+        logging.info(f'[SNAP] load failed: {type(e).__name__}: {e}')
+        return None
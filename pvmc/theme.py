@@ -1,100 +1,283 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
+
 from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QApplication
+
+# Theme keys resolved once per compile; the value is the fallback chain (first present key wins)
+_COLOR_KEYS = {
+    'text_primary': ('text_primary',),
+    'led_on': ('vm_led_on',),
+    'led_off': (),
+    'vm_name_text': ('vm_name_text',),
+    'vm_server_text': ('vm_server_text',),
+    'button_bg': ('button_bg',),
+    'metrics_text': ('metrics_text', 'panel_text'),
+    'gauge_track': ('metrics_gauge_track',),
+    'gauge_text': ('metrics_gauge_text', 'text_primary'),
+    'gauge_ok': ('metrics_gauge_ok', 'status_ok'),
+    'gauge_warn': ('metrics_gauge_warn', 'status_warn'),
+    'gauge_err': ('metrics_gauge_err', 'status_err'),
+}
+_COLOR_DEFAULTS = {
+    'text_primary': '#FFFFFF',
+    'led_on': '#4CAF50',
+    'led_off': '#666666',
+    'vm_name_text': '#FFFFFF',
+    'vm_server_text': '#AAAAAA',
+    'button_bg': '#2f2f45',
+    'metrics_text': '#FFFFFF',
+    'gauge_track': '#444444',
+    'gauge_text': '#FFFFFF',
+    'gauge_ok': '#4CAF50',
+    'gauge_warn': '#FFC107',
+    'gauge_err': '#F44336',
+}
+
+
+@dataclass(frozen=True)
+class ResolvedTheme:
+    """The active theme compiled once: read-only values, resolved colors and ready QSS.
+
+    styles memoizes generated stylesheets (per server color, IMPORTANT variant, ...) for
+    the lifetime of this compile; a theme change builds a new ResolvedTheme.
+    """
+    name: str
+    values: Mapping
+    colors: Mapping  # role -> hex string
+    qcolors: Mapping  # role -> QColor
+    radius: int
+    gradient_css: str
+    metrics_gradient_css: str
+    styles: dict = field(default_factory=dict, compare=False)
+
+
+def _lighten(hex_color, factor, fallback):
+    s = (hex_color or '').strip()
+    if not s:
+        s = fallback
+    if not s.startswith('#'):
+        s = '#' + s
+    s = s[:7]
+    r = int(s[1:3], 16)
+    g = int(s[3:5], 16)
+    b = int(s[5:7], 16)
+    r = min(255, int(r + (255 - r) * float(factor)))
+    g = min(255, int(g + (255 - g) * float(factor)))
+    b = min(255, int(b + (255 - b) * float(factor)))
+    return f"#{r:02X}{g:02X}{b:02X}"
+
+
+def compile_theme(name, t):
+    colors = {}
+    for role, keys in _COLOR_KEYS.items():
+        val = None
+        for k in keys:
+            val = t.get(k)
+            if val:
+                break
+        colors[role] = val or _COLOR_DEFAULTS[role]
+    bg0 = t.get('bg_gradient_start', '#1e1e2a')
+    bg1 = t.get('bg_gradient_end', '#2a2a3a')
+    mbg0 = t.get('metrics_bg_gradient_start', bg0)
+    mbg1 = t.get('metrics_bg_gradient_end', bg1)
+    return ResolvedTheme(
+        name=name,
+        values=MappingProxyType(dict(t)),
+        colors=MappingProxyType(colors),
+        qcolors=MappingProxyType({k: QColor(v) for k, v in colors.items()}),
+        radius=int(t.get('button_radius_px', 10)),
+        gradient_css=f"qlineargradient(x1:0,y1:0,x2:0,y2:1, stop:0 {bg0}, stop:1 {bg1})",
+        metrics_gradient_css=f"qlineargradient(x1:0,y1:0,x2:0,y2:1, stop:0 {mbg0}, stop:1 {mbg1})",
+    )
+
+
+@lru_cache(maxsize=256)
+def server_class(color):
+    """Stylesheet class token for a server color, normalized through QColor ('#abc', 'red' -> 'AABBCC', 'FF0000'); '' for none or invalid."""
+    color = (color or '').strip()
+    if not color:
+        return ''
+    qc = QColor(color)
+    return qc.name()[1:].upper() if qc.isValid() else ''
+
+
+def repolish(widget):
+    # Re-evaluate the application stylesheet after a dynamic property flip
+    st = widget.style()
+    st.unpolish(widget)
+    st.polish(widget)
 
 
 class ThemeManager:
+    """Resolves the active theme and renders it as one application-wide stylesheet.
+
+    Widgets carry no stylesheets of their own; they set object names and dynamic
+    properties (srv = server color class, important, powered, debugOn) that the
+    application stylesheet selects on, so a theme switch is a single polish pass.
+    """
+
     def __init__(self, config_manager):
         self.cm = config_manager
+        self._resolved = None
+        self._revision = None
+        # Server color classes that need per-color rules in the application stylesheet
+        self._server_classes = {''}
+        self._applied_sheet = None
+
+    def resolved(self) -> ResolvedTheme:
+        """Compiled active theme; rebuilt only when ConfigManager.theme_revision moves."""
+        rev = getattr(self.cm, 'theme_revision', None)
+        if self._resolved is None or rev != self._revision:
+            name = self.cm.get_active_theme_name()
+            self._resolved = compile_theme(name, self.cm.get_theme(name))
+            self._revision = rev
+        return self._resolved
 
     def active_theme(self):
-        return self.cm.get_theme()
+        return self.resolved().values
+
+    def color(self, role):
+        return self.resolved().colors[role]
+
+    def qcolor(self, role):
+        """Shared QColor for a theme role (see _COLOR_KEYS); treat as read-only."""
+        return self.resolved().qcolors[role]
+
+    def _memo(self, key, build):
+        styles = self.resolved().styles
+        css = styles.get(key)
+        if css is None:
+            css = build()
+            styles[key] = css
+        return css
 
     def apply_to_window(self, window):
         t = self.active_theme()
-        if t.get('transparent', False):
-            window.setAttribute(Qt.WA_TranslucentBackground, True)
-            window.setStyleSheet('background: transparent;')
-        else:
-            bg0 = t.get('bg_gradient_start', '#1e1e2a')
-            bg1 = t.get('bg_gradient_end', '#2a2a3a')
-            window.setAttribute(Qt.WA_TranslucentBackground, False)
-            window.setStyleSheet(f'QMainWindow {{ background: qlineargradient(x1:0,y1:0,x2:0,y2:1, stop:0 {bg0}, stop:1 {bg1}); }}')
+        window.setAttribute(Qt.WA_TranslucentBackground, bool(t.get('transparent', False)))
+        self.apply_app_stylesheet()
+
+    def server_class(self, color):
+        """Class token for a card's srv property; a color seen for the first time gets its rules added."""
+        cls = server_class(color)
+        if cls not in self._server_classes:
+            self.register_server_colors([color])
+        return cls
+
+    def register_server_colors(self, colors):
+        new = {server_class(c) for c in colors} - self._server_classes
+        if new:
+            self._server_classes |= new
+            self.apply_app_stylesheet()
+
+    def apply_app_stylesheet(self):
+        """Install the application stylesheet; a no-op when nothing in it changed."""
+        app = QApplication.instance()
+        if app is None:
+            return
+        sheet = self.app_stylesheet()
+        if sheet != self._applied_sheet:
+            app.setStyleSheet(sheet)
+            self._applied_sheet = sheet
+
+    def app_stylesheet(self):
+        classes = tuple(sorted(self._server_classes))
+        return self._memo(('app', classes), lambda: self._build_app_stylesheet(classes))
+
+    def _build_app_stylesheet(self, classes):
+        r = self.resolved()
+        c = r.colors
+        t = r.values
+        win_bg = 'transparent' if t.get('transparent', False) else r.gradient_css
+        mgrad = r.metrics_gradient_css
+        rules = [
+            f"QMainWindow {{ background: {win_bg}; }}",
+            # VM cards (VMCard) and the power LED
+            f"QFrame#vmcard {{ background: {c['button_bg']}; border-radius: {r.radius}px; }}",
+            f"QFrame#vmcard QLabel {{ color: {c['vm_name_text']}; }}",
+            f"QFrame#vmcard QLabel#vmserver {{ color: {c['vm_server_text']}; font-size: 10px; }}",
+            f"QFrame#vmcard QLabel#led {{ background: {c['led_off']}; border-radius: 5px; }}",
+            f"QFrame#vmcard QLabel#led[powered=\"true\"] {{ background: {c['led_on']}; }}",
+            f"QFrame#vmcard[important=\"true\"] {{ background: {self.lighten_color(None, 0.25)}; }}",
+            # Host metric cards
+            "QFrame#hostmetricard { background: transparent; border: 1px solid rgba(255,255,255,0.18); border-radius: 6px; }",
+            f"QFrame#hostmetricard QLabel {{ color: {c['metrics_text']}; font-size: 10px; border: none; }}",
+            "QFrame#hostmetrictitle { border-top-left-radius: 6px; border-top-right-radius: 6px; }",
+            f"QFrame#vmreschip {{ background: transparent; }} QFrame#vmreschip QLabel {{ color: {t.get('panel_text', '#FFFFFF')}; font-size: 10px; }}",
+            # Main window chrome
+            f"QScrollArea#metricsScroll, QWidget#metricsBody, QScrollArea#metricsScroll > QWidget#qt_scrollarea_viewport {{ background: {mgrad}; border: none; }}",
+            "QListView#vmList { background: transparent; border: none; }",
+            f"QLabel#rvmcTitle {{ color: {c['text_primary']}; font-weight: bold; font-size: 10px; }}",
+            "QPushButton#btnDebug { background: #E74C3C; color: #FFFFFF; border: none; border-radius: 6px; }",
+            "QPushButton#btnDebug[debugOn=\"true\"] { background: #2ECC71; }",
+        ]
+        for cls in classes:
+            color = f'#{cls}' if cls else None
+            light = self.lighten_color(color, 0.6)
+            pastel = f'rgba({int(light[1:3], 16)},{int(light[3:5], 16)},{int(light[5:7], 16)},80)'
+            rules.append(f"QFrame#hostmetrictitle[srv=\"{cls}\"] {{ background: {pastel}; }}")
+            if cls:
+                rules.append(f"QFrame#vmcard[srv=\"{cls}\"] {{ background: {color}; }}")
+                rules.append(f"QFrame#vmcard[srv=\"{cls}\"][important=\"true\"] {{ background: {self.lighten_color(color, 0.25)}; }}")
+        return '\n'.join(rules)
 
     def gradient_css(self):
-        t = self.active_theme()
-        bg0 = t.get('bg_gradient_start', '#1e1e2a')
-        bg1 = t.get('bg_gradient_end', '#2a2a3a')
-        return f"qlineargradient(x1:0,y1:0,x2:0,y2:1, stop:0 {bg0}, stop:1 {bg1})"
+        return self.resolved().gradient_css
 
     def metrics_gradient_css(self):
-        t = self.active_theme()
-        bg0 = t.get('metrics_bg_gradient_start', t.get('bg_gradient_start', '#1e1e2a'))
-        bg1 = t.get('metrics_bg_gradient_end', t.get('bg_gradient_end', '#2a2a3a'))
-        return f"qlineargradient(x1:0,y1:0,x2:0,y2:1, stop:0 {bg0}, stop:1 {bg1})"
+        return self.resolved().metrics_gradient_css
 
     def metrics_text_color(self):
-        t = self.active_theme()
-        return t.get('metrics_text', t.get('panel_text', '#FFFFFF'))
+        return self.color('metrics_text')
 
     def gauge_track_color(self):
-        t = self.active_theme()
-        return t.get('metrics_gauge_track', '#444444')
+        return self.color('gauge_track')
 
     def gauge_text_color(self):
-        t = self.active_theme()
-        return t.get('metrics_gauge_text', t.get('text_primary', '#FFFFFF'))
+        return self.color('gauge_text')
 
     def gauge_ok_color(self):
-        t = self.active_theme()
-        return t.get('metrics_gauge_ok', t.get('status_ok', '#4CAF50'))
+        return self.color('gauge_ok')
 
     def gauge_warn_color(self):
-        t = self.active_theme()
-        return t.get('metrics_gauge_warn', t.get('status_warn', '#FFC107'))
+        return self.color('gauge_warn')
 
     def gauge_err_color(self):
-        t = self.active_theme()
-        return t.get('metrics_gauge_err', t.get('status_err', '#F44336'))
+        return self.color('gauge_err')
 
     def vm_button_style(self):
         return self.vm_button_style_for()
 
     def vm_button_style_for(self, bg_override=None):
-        t = self.active_theme()
-        bg = bg_override or t.get('button_bg', '#2f2f45')
-        txt = t.get('vm_name_text', '#FFFFFF')
-        radius = int(t.get('button_radius_px', 10))
-        return f'QFrame#vmcard {{ background: {bg}; border-radius: {radius}px; }} QLabel {{ color: {txt}; }}'
+        def build():
+            r = self.resolved()
+            bg = bg_override or r.colors['button_bg']
+            return f"QFrame#vmcard {{ background: {bg}; border-radius: {r.radius}px; }} QLabel {{ color: {r.colors['vm_name_text']}; }}"
+        return self._memo(('vmcard', bg_override), build)
 
     def led_color_on(self):
-        t = self.active_theme()
-        return t.get('vm_led_on', '#4CAF50')
+        return self.color('led_on')
+
+    def led_color_off(self):
+        return self.color('led_off')
 
     def text_primary(self):
-        t = self.active_theme()
-        return t.get('text_primary', '#FFFFFF')
+        return self.color('text_primary')
 
     def lighten_color(self, hex_color, factor=0.2):
-        try:
-            s = (hex_color or '').strip()
-            if not s:
-                s = self.active_theme().get('button_bg', '#2f2f45')
-            if not s.startswith('#'):
-                s = '#' + s
-            s = s[:7]
-            r = int(s[1:3], 16)
-            g = int(s[3:5], 16)
-            b = int(s[5:7], 16)
-            r = min(255, int(r + (255 - r) * float(factor)))
-            g = min(255, int(g + (255 - g) * float(factor)))
-            b = min(255, int(b + (255 - b) * float(factor)))
-            return f"#{r:02X}{g:02X}{b:02X}"
-        except Exception:
-            t = self.active_theme()
-            return t.get('button_bg', '#2F2F45')
+        def build():
+            try:
+                return _lighten(hex_color, factor, self.color('button_bg'))
+            except Exception:
+                return self.active_theme().get('button_bg', '#2F2F45')
+        return self._memo(('lighten', hex_color, factor), build)
 
     def update_theme_value(self, key, value):
         name = self.cm.get_active_theme_name()
-        t = self.cm.get_theme(name)
+        t = dict(self.cm.get_theme(name))
         t[key] = value
         self.cm.set_theme(name, t)
 
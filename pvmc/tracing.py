@@ -0,0 +1,61 @@
+import logging
+
+# Subsystems, named by the tag their log lines start with ("[INV] ...")
+TAGS = ('INV', 'UI', 'WRAP', 'FLOW', 'CARD', 'DOCK', 'MET', 'VMRC')
+
+# Below DEBUG: per-item lines in hot loops (one per card, widget or VM)
+TRACE = 5
+OFF = logging.CRITICAL + 1
+
+LEVEL_NAMES = {'TRACE': TRACE, 'DEBUG': logging.DEBUG, 'INFO': logging.INFO, 'WARNING': logging.WARNING, 'OFF': OFF}
+
+# DEBUG by default: per-batch summaries are logged, per-item TRACE lines are not
+DEFAULT_LEVEL = logging.DEBUG
+_levels = {tag: DEFAULT_LEVEL for tag in TAGS}
+
+
+def enabled(tag, level=logging.DEBUG):
+    """True if a level message for tag would be logged; check before building the message.
+
+        if tracing.enabled('FLOW', tracing.TRACE):
+            logging.debug(f"[FLOW] place widget ...")
+    """
+    return level >= _levels.get(tag, DEFAULT_LEVEL) and logging.root.isEnabledFor(max(level, logging.DEBUG))
+
+
+class TagLevelFilter(logging.Filter):
+    """Drops records below their tag's level, read from the "[TAG] " message prefix.
+
+    Covers every tagged call site, guarded or not; untagged records and tags outside
+    TAGS pass. ERROR and above always pass so failures reach the diagnostics buffer.
+    """
+
+    def filter(self, record):
+        msg = record.msg
+        if record.levelno >= logging.ERROR or not isinstance(msg, str) or not msg.startswith('['):
+            return True
+        end = msg.find(']', 1, 12)
+        if end < 0:
+            return True
+        level = _levels.get(msg[1:end])
+        return level is None or record.levelno >= level
+
+
+def set_level(tag, level):
+    """Change one tag's level at runtime; level is a number or a LEVEL_NAMES key."""
+    if isinstance(level, str):
+        level = LEVEL_NAMES.get(level.upper(), DEFAULT_LEVEL)
+    _levels[tag] = int(level)
+
+
+def get_levels():
+    return dict(_levels)
+
+
+def apply_levels(levels):
+    """Apply a {tag: level} mapping (e.g. the 'trace_levels' config entry); unknown values fall back to DEBUG."""
+    for tag, level in (levels or {}).items():
+        try:
+            set_level(str(tag).strip('[]').upper(), level)
+        except Exception:
+            logging.warning(f'[CFG] Ignoring trace level {tag}={level!r}')
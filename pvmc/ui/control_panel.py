@@ -2,13 +2,14 @@ import json
 import logging
 
 from PySide6.QtCore import Signal
-from PySide6.QtGui import QIntValidator
+from PySide6.QtGui import QColor, QIntValidator
 from PySide6.QtWidgets import (
     QDialog, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTableWidget,
     QTableWidgetItem, QLineEdit, QMessageBox, QCheckBox, QSpinBox, QComboBox, QFileDialog
 )
 from PySide6.QtGui import QGuiApplication
 
+from .performance_tab import PerformanceTab
 from .widgets.color_field import ColorField
 from .widgets.toggle_switch import ToggleSwitch
 from ..logging_utils import set_debug_enabled
@@ -38,6 +39,8 @@ class ControlPanelDialog(QDialog):
         self._build_servers_tab()
         self._build_layout_tab()
         self._build_theme_tab()
+        self.perf_tab = PerformanceTab()
+        self.tabs.addTab(self.perf_tab, 'Performance')
         self._build_about_tab()
         btns = QHBoxLayout()
         btn_close = QPushButton('Close')
@@ -67,6 +70,25 @@ class ControlPanelDialog(QDialog):
         self.cb_running.setChecked(self.cm.get_bool('show_running_only', True))
         self.cb_running.toggled.connect(self._save_running_only)
         v.addWidget(self.cb_running)
+        self.cb_push = QCheckBox('Push updates (follow VM changes live instead of 30s polling)')
+        self.cb_push.setChecked(self.cm.get_bool('push_updates', False))
+        self.cb_push.toggled.connect(self._save_push_updates)
+        v.addWidget(self.cb_push)
+        conc_row = QHBoxLayout()
+        conc_row.addWidget(QLabel('Parallel hosts'))
+        self.spin_parallel = QSpinBox()
+        self.spin_parallel.setRange(1, 32)
+        self.spin_parallel.setValue(self.cm.get_int('max_parallel_hosts', 4))
+        conc_row.addWidget(self.spin_parallel)
+        conc_row.addWidget(QLabel('Host timeout (s)'))
+        self.spin_host_timeout = QSpinBox()
+        self.spin_host_timeout.setRange(3, 300)
+        self.spin_host_timeout.setValue(self.cm.get_int('host_timeout_s', 20))
+        conc_row.addWidget(self.spin_host_timeout)
+        conc_row.addStretch(1)
+        v.addLayout(conc_row)
+        self.spin_parallel.editingFinished.connect(self._save_concurrency)
+        self.spin_host_timeout.editingFinished.connect(self._save_concurrency)
         # Debug logging toggle (green ON / red OFF)
         dbg_row = QHBoxLayout()
         dbg_row.addWidget(QLabel('Debug Logging'))
@@ -237,6 +259,19 @@ class ControlPanelDialog(QDialog):
         self.cm.set_bool('show_running_only', on)
         self.serversChanged.emit()
 
+    def _save_push_updates(self, on):
+        self.cm.set_bool('push_updates', on)
+        self.serversChanged.emit()
+
+    def _save_concurrency(self):
+        n = self.spin_parallel.value()
+        t = self.spin_host_timeout.value()
+        if n == self.cm.get_int('max_parallel_hosts', 4) and t == self.cm.get_int('host_timeout_s', 20):
+            return
+        self.cm.set_int('max_parallel_hosts', n)
+        self.cm.set_int('host_timeout_s', t)
+        self.serversChanged.emit()
+
     def _toggle_debug(self, on):
         self.cm.set_bool('debug_logging', bool(on))
         try:
@@ -308,7 +343,7 @@ class ControlPanelDialog(QDialog):
 
     def _reload_theme_list(self):
         self.combo_theme.clear()
-        names = list(self.cm.config.get('themes', {}).keys())
+        names = self.cm.list_theme_names()
         for n in names:
             self.combo_theme.addItem(n)
         active = self.cm.get_active_theme_name()
@@ -363,7 +398,7 @@ class ControlPanelDialog(QDialog):
         i = 1
         while True:
             new_name = f'NewTheme_{i}'
-            if new_name not in self.cm.config.get('themes', {}):
+            if not self.cm.has_theme(new_name):
                 break
             i += 1
         base.setdefault('name', new_name)
@@ -379,7 +414,7 @@ class ControlPanelDialog(QDialog):
         i = 1
         while True:
             new_name = f'{src}_Copy{i}'
-            if new_name not in self.cm.config.get('themes', {}):
+            if not self.cm.has_theme(new_name):
                 break
             i += 1
         t['name'] = new_name
@@ -395,15 +430,13 @@ class ControlPanelDialog(QDialog):
         if name == self.cm.get_active_theme_name():
             QMessageBox.warning(self, 'Theme', 'Cannot delete the active theme. Set a different active theme first.')
             return
-        themes = self.cm.config.get('themes', {})
-        if len(themes) <= 1:
+        if len(self.cm.list_theme_names()) <= 1:
             QMessageBox.warning(self, 'Theme', 'At least one theme must exist.')
             return
         if QMessageBox.question(self, 'Theme', f"Delete theme '{name}'?") != QMessageBox.Yes:
             return
         try:
-            del themes[name]
-            self.cm.save()
+            self.cm.delete_theme(name)
             self._reload_theme_list()
             self._on_theme_selected(self.cm.get_active_theme_name())
         except Exception:
@@ -419,17 +452,10 @@ class ControlPanelDialog(QDialog):
         t['name'] = new_name
         t['description'] = desc
         if new_name != old_name:
-            themes = self.cm.config.get('themes', {})
-            themes[new_name] = t
-            try:
-                del themes[old_name]
-            except Exception:
-                pass
-            # Update active if it was old_name
-            if self.cm.get_active_theme_name() == old_name:
-                self.cm.set_active_theme(new_name)
-            else:
-                self.cm.save()
+            # Also moves the active theme over if it was old_name
+            if not self.cm.rename_theme(old_name, new_name, t):
+                QMessageBox.warning(self, 'Theme', f"A theme named '{new_name}' already exists.")
+                return
             self._reload_theme_list()
             self.combo_theme.setCurrentText(new_name)
         else:
@@ -470,7 +496,7 @@ class _ServerEditDialog(QDialog):
         self.e_name = QLineEdit(name)
         self.e_name.setPlaceholderText('Friendly name (optional)')
         self.e_color = QLineEdit(color)
-        self.e_color.setPlaceholderText('#RRGGBB (optional)')
+        self.e_color.setPlaceholderText('#RRGGBB or color name (optional)')
         def row(lbl, w):
             h = QHBoxLayout()
             h.addWidget(QLabel(lbl))
@@ -492,6 +518,14 @@ class _ServerEditDialog(QDialog):
         h.addWidget(cancel)
         v.addLayout(h)
 
+    def accept(self):
+        color = self.e_color.text().strip()
+        if color and not QColor(color).isValid():
+            QMessageBox.warning(self, 'Server', f"'{color}' is not a valid color. Use #RRGGBB or a color name.")
+            self.e_color.setFocus()
+            return
+        super().accept()
+
     def values(self):
         return (
             self.e_host.text().strip(),
@@ -1,38 +1,89 @@
 import logging
+import threading
+import time
 
-from PySide6.QtCore import Qt, QTimer, QSize
-from PySide6.QtGui import QAction
+from PySide6.QtCore import Qt, QTimer, QSize, QObject, Signal, QEvent
+from PySide6.QtGui import QAction, QFont
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QPushButton, QLabel, QMessageBox, QApplication, QScrollArea
 )
 from PySide6.QtGui import QGuiApplication
 
-from ..config import ConfigManager
-from ..theme import ThemeManager
+from ..config import get_config_manager
+from ..theme import ThemeManager, repolish
 from ..appbar import AppBarManager
 from ..esxi import ESXiClient
+from ..snapshot import load_snapshot
+from ..watchdog import StallWatchdog
+from .. import perf, tracing
 from .control_panel import ControlPanelDialog
+from .refresh_worker import RefreshWorker, running_vms
+from .stall_probe import BEAT_MS, StallProbe
 from .widgets.wrap_panel import WrapPanel
 from .widgets.vm_card import VMCard
+from .widgets.vm_list_view import VMListView
+from .widgets.card_effects import PulseClock
 from .widgets.host_metrics_card import HostMetricsCard
 from ..logging_utils import save_diagnostics, set_debug_enabled, get_debug_enabled
 
 
+class _PushBridge(QObject):
+    # Emitted from HostWatcher threads; queued onto the GUI thread by Qt
+    event = Signal(object)
+
+
 class PentaVMControlMainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle('PentaVMControl')
-        self.cm = ConfigManager()
+        self.cm = get_config_manager()
         self.tm = ThemeManager(self.cm)
         self.appbar = AppBarManager()
-        self.esxi = ESXiClient(show_running_only=self.cm.get_bool('show_running_only', True))
+        self.esxi = ESXiClient(show_running_only=self.cm.get_bool('show_running_only', True),
+                               max_parallel_hosts=self.cm.get_int('max_parallel_hosts', 4),
+                               host_timeout=self.cm.get_int('host_timeout_s', 20))
         self._disable_appbar_session = False
+        # Last rendered VM list and cards keyed by (server, moid)
+        self._last_vms = []
+        self._cards = {}
+        # True while the VM area is the virtualized list instead of per-VM cards
+        self._virtualized = False
+        # Push mode: per-host {moid: record} kept current by HostWatcher events
+        self._push_vms = {}
+        self._push_rebuild_pending = False
+        self._push_bridge = _PushBridge(self)
+        self._push_bridge.event.connect(self._on_push_event)
+        # Push events keep the warm-start snapshot current; saves are coalesced into one per window
+        self._push_snapshot_timer = QTimer(self)
+        self._push_snapshot_timer.setSingleShot(True)
+        self._push_snapshot_timer.setInterval(5000)
+        self._push_snapshot_timer.timeout.connect(self._save_push_snapshot)
+        self._last_host_metrics = []
+        # ESXi collection runs off the GUI thread; results come back through finished
+        self.refresher = RefreshWorker(self.esxi, self, snapshot_dir=self.cm.appdata)
+        # Warm start: cached inventory painted before the first live refresh, flagged stale
+        self._snapshot_shown = False
+        self._stale_since = None
+        self._failed_hosts = {}
+        self.refresher.finished.connect(self._on_refresh_finished)
+        # Event-loop stall counter for the Performance tab and diagnostics
+        self.stall_probe = StallProbe(self)
+        self.stall_probe.start()
+        # Captures this (GUI) thread's stack from outside while it is blocked
+        self.watchdog = None
+        stall_ms = self.cm.get_int('stall_threshold_ms', 500)
+        if stall_ms > 0:
+            probe = self.stall_probe
+            self.watchdog = StallWatchdog(lambda: probe.last_beat, threading.get_ident(), BEAT_MS, stall_ms)
+            self.watchdog.start()
         logging.debug(f"[CFG] Config path: {self.cm.config_path}")
         logging.debug(f"[CFG] Initial layout: {self.cm.get_layout()}")
         logging.debug(f"[CFG] Flags: show_running_only={self.cm.get_bool('show_running_only', True)} disable_appbar={self.cm.get_bool('disable_appbar', False)} skip_inventory_on_startup={self.cm.get_bool('skip_inventory_on_startup', False)}")
         self.timer = QTimer(self)
         self.timer.setInterval(30000)
         self.timer.timeout.connect(self.refresh_inventory)
+        # Per-server-color rules go into the application stylesheet before any card exists
+        self.tm.register_server_colors([s.get('color') for s in self.cm.get_servers()])
         self._build_ui()
         self.tm.apply_to_window(self)
 
@@ -41,19 +92,24 @@ class PentaVMControlMainWindow(QMainWindow):
         # Left: VM wrap panel (expands)
         self.panel = WrapPanel(margin=8, hspacing=8, vspacing=8)
         logging.debug('[UI] WrapPanel created')
+        # Alternate VM area for large fleets; swapped in by rebuild_ui above virtualize_above_vms
+        self.vm_list = VMListView(self.tm, self._open_console, self._start_vm, self._stop_vm, self._reboot_vm,
+                                  margin=8, hspacing=8, vspacing=8)
+        self.vm_list.hide()
 
         # Middle-right: fixed-width metrics scroll area (vertical only)
         self.metrics_scroll = QScrollArea()
+        self.metrics_scroll.setObjectName('metricsScroll')
         self.metrics_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.metrics_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.metrics_scroll.setWidgetResizable(True)
         self.metrics_body = QWidget()
+        self.metrics_body.setObjectName('metricsBody')
         self.metrics_v = QVBoxLayout(self.metrics_body)
         self.metrics_v.setContentsMargins(6, 6, 6, 6)
         self.metrics_v.setSpacing(8)
         self.metrics_scroll.setWidget(self.metrics_body)
         self._apply_metrics_width()
-        self._apply_metrics_background()
 
         # Far-right: fixed-width side panel for controls/title
         self.side = QWidget()
@@ -62,7 +118,7 @@ class PentaVMControlMainWindow(QMainWindow):
         side_l.setSpacing(8)
         self.btn_refresh = QPushButton('⟳')
         self.btn_refresh.setToolTip('Refresh')
-        self.btn_refresh.clicked.connect(self.refresh_inventory)
+        self.btn_refresh.clicked.connect(self._full_refresh)
         self.btn_gear = QPushButton('⚙')
         self.btn_gear.setToolTip('Control Panel')
         self.btn_gear.clicked.connect(self.open_control_panel)
@@ -70,15 +126,16 @@ class PentaVMControlMainWindow(QMainWindow):
         self.btn_diag.setToolTip('Save Diagnostics Bundle')
         self.btn_diag.clicked.connect(self._save_diagnostics_bundle)
         self.btn_debug = QPushButton('🐞')
+        self.btn_debug.setObjectName('btnDebug')
         self.btn_debug.setToolTip('Toggle Debug Logs')
         self.btn_debug.clicked.connect(self._toggle_debug_logs)
         self.btn_exit = QPushButton('⏻')
         self.btn_exit.setToolTip('Exit Program')
         self.btn_exit.clicked.connect(self._exit_app)
         self.title_lbl = QLabel('RVMC')
+        self.title_lbl.setObjectName('rvmcTitle')
         self.title_lbl.setWordWrap(True)
         self.title_lbl.setAlignment(Qt.AlignCenter)
-        self.title_lbl.setStyleSheet(f'color: {self.tm.text_primary()}; font-weight: bold; font-size: 10px;')
         # Even spacing: buttons centered with stretch above and below; label pinned at bottom
         side_l.addStretch(1)
         side_l.addWidget(self.btn_refresh, 0, Qt.AlignHCenter)
@@ -100,6 +157,7 @@ class PentaVMControlMainWindow(QMainWindow):
         root_l.setContentsMargins(0, 0, 0, 0)
         root_l.setSpacing(0)
         root_l.addWidget(self.panel, 1)
+        root_l.addWidget(self.vm_list, 1)
         root_l.addWidget(self.metrics_scroll, 0)
         root_l.addWidget(self.side, 0)
         self.setCentralWidget(root)
@@ -125,15 +183,40 @@ class PentaVMControlMainWindow(QMainWindow):
         super().showEvent(event)
         logging.debug('[DOCK] showEvent: positioning and docking...')
         self.position_and_dock()
+        PulseClock.instance().wake()
+        if not self._snapshot_shown:
+            self._snapshot_shown = True
+            self._show_snapshot()
         skip = self.cm.get_bool('skip_inventory_on_startup', False)
         if skip:
             logging.debug('[INV] Startup: skip_inventory_on_startup=True; not refreshing or starting timer')
         else:
-            QTimer.singleShot(200, self.refresh_inventory)
+            QTimer.singleShot(200, self._full_refresh)
             self.timer.start()
+            self._start_push_updates()
+
+    def changeEvent(self, event):
+        # Restored from minimized: the pulse clock stopped itself while nothing was on screen
+        if event.type() == QEvent.WindowStateChange and not self.isMinimized():
+            PulseClock.instance().wake()
+        super().changeEvent(event)
+
+    def hideEvent(self, event):
+        PulseClock.instance().pause()
+        super().hideEvent(event)
 
     def closeEvent(self, event):
+        self.timer.stop()
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        self.refresher.shutdown()
         self.appbar.unregister(self)
+        try:
+            self.esxi.close()
+        except Exception as e:
+            logging.error(f"[EXIT] Session pool close failed: {type(e).__name__}: {e}")
+        # Don't leave a debounced config write pending
+        self.cm.flush()
         super().closeEvent(event)
 
     def position_and_dock(self):
@@ -189,47 +272,118 @@ class PentaVMControlMainWindow(QMainWindow):
             except Exception as e:
                 logging.error(f'[DOCK] AppBar register failed (right): {e}')
 
-    def rebuild_ui(self, vms):
+    def rebuild_ui(self, vms, host_metrics=None):
+        """Reconcile the VM cards with vms, keyed by (server, moid).
+
+        Existing cards are updated in place, new VMs get new cards, vanished VMs lose
+        theirs, and the panel is relaid out only when membership or order changed.
+        """
         logging.info('[INV] UI rebuild started.')
-        logging.debug(f'[UI] Rebuilding UI with {len(vms)} VM items')
-        old = self.panel.count()
-        logging.debug(f'[UI] Clearing existing widgets: count={old}')
-        self.panel.clear()
-        style = self.tm.vm_button_style()
+        t0 = time.perf_counter()
+        logging.debug(f'[UI] Reconciling UI with {len(vms)} VM items (current={self._vm_count()})')
+        self._last_vms = list(vms)
+        layout = self.cm.get_layout()
+        bw = layout.get('button_width', 160)
+        bh = layout.get('button_height', 48)
+        threshold = self.cm.get_int('virtualize_above_vms', 400)
+        virtualize = threshold > 0 and len(vms) > threshold
+        switched = virtualize != self._virtualized
+        if switched:
+            self._set_virtualized(virtualize)
+        if virtualize:
+            changed = self.vm_list.setVms(vms, QSize(bw, bh)) or switched
+            perf.record('reconcile', (time.perf_counter() - t0) * 1000)
+            self._rebuild_metrics_and_redock(host_metrics, changed)
+            logging.debug(f'[UI] UI rebuild completed (virtualized): items={len(vms)} relayout={changed}')
+            logging.info('[INV] UI rebuild completed successfully.')
+            return
+        old_cards = self._cards
+        new_cards = {}
+        order = []
         added = 0
+        updated = 0
+        resized = False
         for vm in vms:
-            logging.debug(f"[UI] Add VM card: name={vm.get('name')} server={vm.get('server')} moid={vm.get('moid')} state={vm.get('power_state')}")
+            key = (vm.get('server'), vm.get('moid'))
+            if key in new_cards:
+                # Duplicate key (e.g. missing moid); keep it distinct rather than merging cards
+                key = key + (len(order),)
+            card = old_cards.pop(key, None)
             try:
-                card = VMCard(self.tm, vm, self._open_console, self._start_vm, self._stop_vm, self._reboot_vm)
-                card.setFixedSize(self.cm.get_layout().get('button_width', 160), self.cm.get_layout().get('button_height', 48))
-                try:
-                    card.setStyleSheet(self.tm.vm_button_style_for(vm.get('server_color')))
-                except Exception:
-                    card.setStyleSheet(style)
-                self.panel.addWidget(card)
-                added += 1
+                if card is not None:
+                    card.update_vm(vm)
+                    if card.width() != bw or card.height() != bh:
+                        card.setFixedSize(bw, bh)
+                        resized = True
+                    updated += 1
+                else:
+                    if tracing.enabled('UI', tracing.TRACE):
+                        logging.debug(f"[UI] Add VM card: name={vm.get('name')} server={vm.get('server')} moid={vm.get('moid')} state={vm.get('power_state')}")
+                    card = VMCard(self.tm, vm, self._open_console, self._start_vm, self._stop_vm, self._reboot_vm)
+                    card.setFixedSize(bw, bh)
+                    added += 1
+                new_cards[key] = card
+                order.append(card)
             except Exception as e:
                 import traceback
                 logging.error(f"[UI] VM card build failed for '{vm.get('name')}': {type(e).__name__}: {e}")
                 traceback.print_exc()
-        try:
-            servers = self.cm.get_servers()
-            host_metrics = []
+        removed = len(old_cards)
+        self._cards = new_cards
+        changed = resized or switched or (order != self.panel.widgets())
+        if changed:
+            # Drops the cards left in old_cards and lays out the new order once
+            self.panel.setWidgets(order)
+        perf.record('reconcile', (time.perf_counter() - t0) * 1000)
+        self._rebuild_metrics_and_redock(host_metrics, changed)
+        logging.debug(f'[UI] UI rebuild completed: added={added} updated={updated} removed={removed} relayout={changed}')
+        logging.info('[INV] UI rebuild completed successfully.')
+
+    def _rebuild_metrics_and_redock(self, host_metrics, changed):
+        # Host cards come from the same collection pass; None keeps the current ones (push deltas)
+        if host_metrics is not None:
             try:
-                host_metrics = self.esxi.fetch_hosts_metrics(servers)
+                self._rebuild_metrics(host_metrics)
             except Exception as e:
-                logging.info(f"[MET] fetch error: {type(e).__name__}: {e}")
-            self._rebuild_metrics(host_metrics)
-        except Exception as e:
-            logging.error(f"[MET] rebuild error: {type(e).__name__}: {e}")
-        # Avoid central sizeHint calls here; just log item count
-        logging.debug(f"[UI] Pre-redock: items={self.panel.count()}")
-        logging.debug('[DOCK] Scheduling redock to content on next event loop tick')
-        QTimer.singleShot(0, self._redock_to_content)
-        logging.debug(f'[UI] UI rebuild completed: added={added} (cleared={old})')
-        logging.info('[INV] UI rebuild completed successfully.')
+                logging.error(f"[MET] rebuild error: {type(e).__name__}: {e}")
+        if changed:
+            # Row count may have changed; avoid central sizeHint calls and redock next tick
+            logging.debug(f"[UI] Pre-redock: items={self._vm_count()}")
+            logging.debug('[DOCK] Scheduling redock to content on next event loop tick')
+            QTimer.singleShot(0, self._redock_to_content)
+
+    def _set_virtualized(self, on):
+        logging.info(f"[UI] VM area: {'virtualized list' if on else 'card widgets'}")
+        self._virtualized = on
+        if on:
+            # Per-VM widgets are dropped entirely; the list paints from the VM dicts
+            self.panel.setWidgets([])
+            self._cards = {}
+            self.panel.hide()
+            self.vm_list.show()
+        else:
+            self.vm_list.setVms([])
+            self.vm_list.hide()
+            self.panel.show()
+
+    def _vm_area(self):
+        return self.vm_list if self._virtualized else self.panel
+
+    def _vm_count(self):
+        return self._vm_area().count()
+
+    def _dock_rows(self, n, cols, bh, vsp, screen_h):
+        rows = max(1, (n + cols - 1) // cols)
+        if self._virtualized:
+            # The list scrolls, so the bar never takes more than half the screen
+            rows = min(rows, max(1, (screen_h // 2) // (bh + vsp)))
+        return rows
 
     def _redock_to_content(self):
+        with perf.timed('redock'):
+            self._do_redock()
+
+    def _do_redock(self):
         layout = self.cm.get_layout()
         dock = layout.get('dock_position', 'top')
         disable_appbar = self.cm.get_bool('disable_appbar', False) or self._disable_appbar_session
@@ -251,8 +405,7 @@ class PentaVMControlMainWindow(QMainWindow):
                     metrics_w = self.metrics_scroll.width() if hasattr(self, 'metrics_scroll') else self.cm.get_layout().get('metrics_panel_width', 180)
                     avail_w = g_av.width() - side_w - metrics_w - 2 * margin
                     cols = max(1, int((avail_w + hsp) // (bw + hsp)))
-                    n = self.panel.count()
-                    rows = max(1, (n + cols - 1) // cols)
+                    rows = self._dock_rows(self._vm_count(), cols, bh, vsp, g_av.height())
                     desired = 2 * margin + rows * bh + (rows - 1) * vsp
                     logging.debug(f"[DOCK] Redock(normal) top: avail_w={avail_w} side_w={side_w} metrics_w={metrics_w} cols={cols} rows={rows} desired_h={desired}")
                 except Exception as e:
@@ -282,8 +435,7 @@ class PentaVMControlMainWindow(QMainWindow):
                 metrics_w = self.metrics_scroll.width() if hasattr(self, 'metrics_scroll') else self.cm.get_layout().get('metrics_panel_width', 180)
                 full_w = g_full.width() - side_w - metrics_w - 2 * margin
                 cols = max(1, int((full_w + hsp) // (bw + hsp)))
-                n = self.panel.count()
-                rows = max(1, (n + cols - 1) // cols)
+                rows = self._dock_rows(self._vm_count(), cols, bh, vsp, g_full.height())
                 desired = 2 * margin + rows * bh + (rows - 1) * vsp
                 logging.debug(f"[DOCK] Redock(appbar) top: full_w={full_w} side_w={side_w} metrics_w={metrics_w} cols={cols} rows={rows} desired_h={desired}")
             except Exception as e:
@@ -329,43 +481,201 @@ class PentaVMControlMainWindow(QMainWindow):
         logging.debug(f"[DOCK] Post-redock window geometry=({geom_after.x()},{geom_after.y()},{geom_after.width()}x{geom_after.height()})")
 
     def refresh_inventory(self):
-        servers = self.cm.get_servers()
-        self.esxi.show_running_only = self.cm.get_bool('show_running_only', True)
-        vms = []
-        try:
-            logging.debug(f"[INV] Refresh: servers={len(servers)} show_running_only={self.esxi.show_running_only}")
-            vms = self.esxi.fetch_inventory(servers)
-        except Exception as e:
-            logging.info(f'[INV] FATAL CRASH: {type(e).__name__}: {e}')
+        # Timer tick: coalesced into a refresh that is still running
+        if self.esxi.is_watching():
+            # Push mode: VM changes arrive from the watchers; the timer only refreshes host gauges
+            self._refresh_host_metrics()
+            return
+        self._request_refresh(force=False)
+
+    def _full_refresh(self):
+        self._request_refresh(force=True)
+
+    def _request_refresh(self, force):
+        # The worker reads this frozen version, so settings edited mid-refresh apply to the next one
+        snap = self.cm.snapshot()
+        self.esxi.show_running_only = snap.get_bool('show_running_only', True)
+        logging.debug(f"[INV] Refresh: config v{snap.version} servers={len(snap.servers)} show_running_only={self.esxi.show_running_only}")
+        self.refresher.request(snap, force=force)
+
+    def _on_refresh_finished(self, result):
+        if result.vms is None:
+            try:
+                self._rebuild_metrics(list(result.host_metrics))
+            except Exception as e:
+                logging.error(f"[MET] rebuild error: {type(e).__name__}: {e}")
+            return
+        logging.debug(f"[INV] Background refresh finished in {result.elapsed * 1000:.0f} ms")
+        if self._stale_since is not None and result.failed_hosts and not result.vms and not result.host_metrics:
+            # No host answered: keep the warm-start cards and their cached marker, like save_snapshot does
+            logging.info(f'[SNAP] No host reachable; keeping cached inventory ({len(result.failed_hosts)} failed)')
+            self._show_failed_hosts(result.failed_hosts)
+            return
+        self._stale_since = None
+        self._show_failed_hosts(result.failed_hosts)
         try:
-            self.rebuild_ui(vms)
+            self.rebuild_ui(list(result.vms), list(result.host_metrics))
         except Exception as e:
             import traceback
             logging.error(f"[INV] UI rebuild exception: {type(e).__name__}: {e}")
             traceback.print_exc()
         finally:
+            # Picks up this cycle's reconcile timing in the tooltip
+            self._update_title()
             logging.debug('[INV] Refresh cycle complete')
 
+    def _show_failed_hosts(self, failed):
+        # Surface unreachable hosts on the side title instead of blocking the bar
+        self._failed_hosts = dict(failed or {})
+        self._update_title()
+
+    def _update_title(self):
+        text = 'RVMC'
+        tips = []
+        if self._stale_since is not None:
+            text += '\n(cached)'
+            tips.append(f"Showing cached inventory from {time.strftime('%Y-%m-%d %H:%M', time.localtime(self._stale_since))}; waiting for live data")
+        if self._failed_hosts:
+            text += f'\n⚠{len(self._failed_hosts)}'
+            tips.append('Unreachable hosts:\n' + '\n'.join(f'{h}: {why}' for h, why in sorted(self._failed_hosts.items())))
+        timings = perf.summary_lines()
+        if timings:
+            tips.append('Timings:\n' + '\n'.join(timings))
+        self.title_lbl.setText(text)
+        self.title_lbl.setToolTip('\n\n'.join(tips))
+
+    def _show_snapshot(self):
+        snap = load_snapshot(self.cm.appdata)
+        if not snap:
+            return
+        servers = {s.get('host') for s in self.cm.get_servers()}
+        # Saved unfiltered; filtered here exactly as the live results are
+        vms = [v for v in snap.get('vms', []) if v.get('server') in servers]
+        if self.cm.get_bool('show_running_only', True):
+            vms = running_vms(vms)
+        metrics = [m for m in snap.get('host_metrics', []) if m.get('host') in servers]
+        logging.info(f"[SNAP] Warm start: {len(vms)} cached VM(s) from {time.strftime('%H:%M:%S', time.localtime(snap.get('saved_at', 0)))}")
+        self._stale_since = snap.get('saved_at') or time.time()
+        self._update_title()
+        try:
+            self.rebuild_ui(vms, metrics)
+        except Exception as e:
+            logging.error(f"[SNAP] Warm start render failed: {type(e).__name__}: {e}")
+
+    def _start_push_updates(self):
+        self.esxi.stop_watching()
+        self._push_vms = {}
+        if not self.cm.get_bool('push_updates', False):
+            return
+        self.esxi.start_watching(self.cm.snapshot().servers, self._push_bridge.event.emit)
+
+    def _on_servers_changed(self):
+        self.tm.register_server_colors([s.get('color') for s in self.cm.get_servers()])
+        self.esxi.set_concurrency(self.cm.get_int('max_parallel_hosts', 4), self.cm.get_int('host_timeout_s', 20))
+        self._start_push_updates()
+        self._full_refresh()
+
+    def _on_push_event(self, ev):
+        host = ev.get('host')
+        if self._stale_since is not None:
+            # Live data from a watcher: the warm-start cards are no longer just cached
+            self._stale_since = None
+            self._update_title()
+        if not self._push_snapshot_timer.isActive():
+            self._push_snapshot_timer.start()
+        if ev.get('kind') == 'resync':
+            self._push_vms[host] = {v.get('moid'): v for v in ev.get('vms', [])}
+            logging.debug(f"[INV] Push resync {host}: {len(self._push_vms[host])} VM(s)")
+            self._schedule_push_rebuild()
+            return
+        cache = self._push_vms.setdefault(host, {})
+        if self._virtualized:
+            # No per-VM widgets to patch; the model diff touches only the changed rows
+            for moid in ev.get('removed', []):
+                cache.pop(moid, None)
+            for v in ev.get('vms', []):
+                cache[v.get('moid')] = v
+            self._schedule_push_rebuild()
+            return
+        membership_changed = False
+        for moid in ev.get('removed', []):
+            cache.pop(moid, None)
+            if (host, moid) in self._cards:
+                membership_changed = True
+        for v in ev.get('vms', []):
+            cache[v.get('moid')] = v
+            card = self._cards.get((host, v.get('moid')))
+            visible = self._vm_visible(v)
+            if card is None:
+                membership_changed = membership_changed or visible
+            elif not visible:
+                membership_changed = True
+            else:
+                card.update_vm(v)
+        logging.debug(f"[INV] Push delta {host}: changed={len(ev.get('vms', []))} removed={len(ev.get('removed', []))} rebuild={membership_changed}")
+        if membership_changed:
+            self._schedule_push_rebuild()
+
+    def _save_push_snapshot(self):
+        # Same rule as the refresh worker: hosts without push data yet keep their previous entries
+        hosts = [s.get('host') for s in self.cm.get_servers()]
+        failed = {h: 'no push data yet' for h in hosts if h not in self._push_vms}
+        if not hosts or len(failed) >= len(hosts):
+            return
+        vms = [v for h in hosts if h in self._push_vms for v in self._push_vms[h].values()]
+        self.refresher.save_snapshot_async(vms, self._last_host_metrics, failed)
+
+    def _vm_visible(self, vm):
+        if not self.cm.get_bool('show_running_only', True):
+            return True
+        return (vm.get('power_state', '').lower() == 'poweredon')
+
+    def _push_merged_vms(self):
+        # Hosts whose watcher has not delivered a resync yet keep their last polled VMs
+        vms = []
+        for s in self.cm.get_servers():
+            host = s.get('host')
+            if host in self._push_vms:
+                vms.extend(v for v in self._push_vms[host].values() if self._vm_visible(v))
+            else:
+                vms.extend(v for v in self._last_vms if v.get('server') == host)
+        return vms
+
+    def _schedule_push_rebuild(self):
+        if self._push_rebuild_pending:
+            return
+        self._push_rebuild_pending = True
+        QTimer.singleShot(0, self._push_rebuild)
+
+    def _push_rebuild(self):
+        self._push_rebuild_pending = False
+        try:
+            self.rebuild_ui(self._push_merged_vms())
+        except Exception as e:
+            logging.error(f"[INV] Push rebuild exception: {type(e).__name__}: {e}")
+
+    def _refresh_host_metrics(self):
+        self.refresher.request(self.cm.snapshot(), metrics_only=True)
+
     def open_control_panel(self):
         logging.debug('[UI] Opening control panel dialog')
         dlg = ControlPanelDialog(self.cm, self.tm, self)
-        dlg.serversChanged.connect(self.refresh_inventory)
-        dlg.layoutChanged.connect(lambda: (self._apply_side_width(), self._apply_metrics_width(), self.position_and_dock(), self.refresh_inventory()))
+        dlg.serversChanged.connect(self._on_servers_changed)
+        dlg.layoutChanged.connect(lambda: (self._apply_side_width(), self._apply_metrics_width(), self.position_and_dock(), self._full_refresh()))
         dlg.themeChanged.connect(self._apply_theme_live)
         dlg.exec()
 
     def _apply_theme_live(self):
         logging.debug('[THEME] Applying live theme updates to window and VM cards')
+        # One application stylesheet swap restyles every card; no per-card setStyleSheet
         self.tm.apply_to_window(self)
         try:
-            # Iterate over current widgets in WrapPanel
-            for w in self.panel.findChildren(QWidget, options=Qt.FindDirectChildrenOnly):
-                if hasattr(w, 'updateTheme'):
-                    w.updateTheme()
+            # Painted (non-QSS) parts: cached card shadows/glows, list delegate colors, host gauges
+            self.panel.update()
+            self.vm_list.updateTheme()
             for w in self.metrics_body.findChildren(QWidget, options=Qt.FindDirectChildrenOnly):
                 if hasattr(w, 'updateTheme'):
                     w.updateTheme()
-            self._apply_metrics_background()
         except Exception as e:
             logging.error(f"[THEME] apply live error: {type(e).__name__}: {e}")
 
@@ -378,7 +688,7 @@ class PentaVMControlMainWindow(QMainWindow):
             return
         vmrc_path = self.cm.get_vmrc_path()
         creds = self._creds_for(host)
-        ok = self.esxi.launch_vmrc(host, moid, vmrc_path, creds)
+        ok = self.esxi.launch_vmrc(host, moid, vmrc_path, creds, instance_uuid=vm.get('instance_uuid'))
         if not ok:
             QMessageBox.warning(self, 'VMRC', 'Failed to launch VMRC. Ensure VMware Remote Console is installed or set vmrc_path in config.')
 
@@ -390,8 +700,8 @@ class PentaVMControlMainWindow(QMainWindow):
         if not creds:
             QMessageBox.warning(self, 'Start VM', 'No credentials for host.')
             return
-        self.esxi.power_on(creds['host'], creds['username'], creds['password'], vm.get('moid'))
-        QTimer.singleShot(1000, self.refresh_inventory)
+        self.esxi.power_on(creds['host'], creds['username'], creds['password'], vm.get('moid'), vm.get('instance_uuid'))
+        QTimer.singleShot(1000, self._full_refresh)
 
     def _stop_vm(self, vm):
         logging.debug(f"[ACTION] Guest shutdown requested: host={vm.get('server')} moid={vm.get('moid')} name={vm.get('name')}")
@@ -401,10 +711,10 @@ class PentaVMControlMainWindow(QMainWindow):
         if not creds:
             QMessageBox.warning(self, 'Guest Shutdown', 'No credentials for host.')
             return
-        ok = self.esxi.shutdown_guest(creds['host'], creds['username'], creds['password'], vm.get('moid'))
+        ok = self.esxi.shutdown_guest(creds['host'], creds['username'], creds['password'], vm.get('moid'), vm.get('instance_uuid'))
         if not ok:
             QMessageBox.warning(self, 'Guest Shutdown', 'Guest shutdown failed. Ensure VMware Tools is installed and running in the guest.')
-        QTimer.singleShot(1000, self.refresh_inventory)
+        QTimer.singleShot(1000, self._full_refresh)
 
     def _reboot_vm(self, vm):
         logging.debug(f"[ACTION] Guest reboot requested: host={vm.get('server')} moid={vm.get('moid')} name={vm.get('name')}")
@@ -414,10 +724,10 @@ class PentaVMControlMainWindow(QMainWindow):
         if not creds:
             QMessageBox.warning(self, 'Guest Restart', 'No credentials for host.')
             return
-        ok = self.esxi.reboot_guest(creds['host'], creds['username'], creds['password'], vm.get('moid'))
+        ok = self.esxi.reboot_guest(creds['host'], creds['username'], creds['password'], vm.get('moid'), vm.get('instance_uuid'))
         if not ok:
             QMessageBox.warning(self, 'Guest Restart', 'Guest restart failed. Ensure VMware Tools is installed and running in the guest.')
-        QTimer.singleShot(1500, self.refresh_inventory)
+        QTimer.singleShot(1500, self._full_refresh)
 
     def _creds_for(self, host):
         for s in self.cm.get_servers():
@@ -432,13 +742,13 @@ class PentaVMControlMainWindow(QMainWindow):
             # Compute uniform button size from available side width (leave margins)
             btn_size = max(28, min(self.side.width() - 8, 46))
             font_px = max(14, int(btn_size * 0.45))
+            # Size is layout, not theme: set as a font so the buttons keep no stylesheet of their own
+            f = QFont(self.btn_refresh.font())
+            f.setPixelSize(font_px)
             for b in (self.btn_refresh, self.btn_gear, self.btn_diag, self.btn_debug, self.btn_exit):
                 b.setFixedSize(btn_size, btn_size)
-            self.btn_refresh.setStyleSheet(f'font-size: {font_px}px;')
-            self.btn_gear.setStyleSheet(f'font-size: {font_px}px;')
-            self.btn_diag.setStyleSheet(f'font-size: {font_px}px;')
-            self.btn_exit.setStyleSheet(f'font-size: {font_px}px;')
-            self._apply_debug_button_style(font_px)
+                b.setFont(f)
+            self._apply_debug_button_style()
             logging.debug(f"[UI] Applied side width: {self.side.width()} px; button size: {btn_size}px; font: {font_px}px")
         except Exception as e:
             logging.error(f"[UI] apply side width error: {type(e).__name__}: {e}")
@@ -451,25 +761,8 @@ class PentaVMControlMainWindow(QMainWindow):
         except Exception as e:
             logging.error(f"[UI] apply metrics width error: {type(e).__name__}: {e}")
 
-    def _apply_metrics_background(self):
-        try:
-            grad = self.tm.metrics_gradient_css()
-            # Apply on scroll area (frame) and its viewport/body to avoid white backgrounds
-            self.metrics_scroll.setStyleSheet(
-                f"QScrollArea {{ background: {grad}; border: none; }}"
-            )
-            try:
-                self.metrics_scroll.viewport().setStyleSheet(f"background: {grad}; border: none;")
-            except Exception:
-                pass
-            try:
-                self.metrics_body.setStyleSheet(f"background: {grad};")
-            except Exception:
-                pass
-        except Exception as e:
-            logging.error(f"[UI] apply metrics background error: {type(e).__name__}: {e}")
-
     def _rebuild_metrics(self, hosts):
+        self._last_host_metrics = list(hosts)
         try:
             while self.metrics_v.count():
                 it = self.metrics_v.takeAt(0)
@@ -505,12 +798,13 @@ class PentaVMControlMainWindow(QMainWindow):
         except Exception as e:
             logging.error(f"[DBG] Toggle failed: {type(e).__name__}: {e}")
 
-    def _apply_debug_button_style(self, font_px=None):
+    def _apply_debug_button_style(self):
         try:
             on = get_debug_enabled()
-            bg = '#2ECC71' if on else '#E74C3C'
-            fs = '' if font_px is None else f'font-size: {font_px}px;'
-            self.btn_debug.setStyleSheet(f'background: {bg}; color: #FFFFFF; border: none; border-radius: 6px; {fs}')
+            # Green/red comes from QPushButton#btnDebug[debugOn=...] in the application stylesheet
+            if self.btn_debug.property('debugOn') != on:
+                self.btn_debug.setProperty('debugOn', on)
+                repolish(self.btn_debug)
             self.btn_debug.setToolTip('Debug: ON' if on else 'Debug: OFF')
         except Exception:
             pass
@@ -518,6 +812,8 @@ class PentaVMControlMainWindow(QMainWindow):
     def _exit_app(self):
         try:
             if QMessageBox.question(self, 'Exit', 'Are you sure you want to exit the program?') == QMessageBox.Yes:
+                # close() first so closeEvent releases the AppBar and logs out of ESXi sessions
+                self.close()
                 QApplication.instance().quit()
         except Exception as e:
             logging.error(f"[EXIT] Failed to quit: {type(e).__name__}: {e}")
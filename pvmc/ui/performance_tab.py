@@ -0,0 +1,154 @@
+import json
+import logging
+import time
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import (
+    QApplication, QFileDialog, QGridLayout, QHBoxLayout, QLabel, QMessageBox, QPushButton, QTableWidget,
+    QTableWidgetItem, QVBoxLayout, QWidget
+)
+
+from .. import perf
+from .widgets.sparkline import Sparkline
+from .widgets.vm_card import VMCard
+
+# Poll period while the tab is on screen
+UPDATE_MS = 1000
+
+_API_CALLS = ('Login', 'RetrievePropertiesEx', 'ContinueRetrievePropertiesEx', 'WaitForUpdatesEx', 'AcquireCloneTicket')
+_HOST_COLUMNS = ['Host', 'Connect p50', 'Retrieve last', 'Retrieve p50', 'Retrieve p95', 'Retrieve p99', 'Parse p50', 'API calls / refresh']
+
+
+def _ms(s, key):
+    return f"{s[key]:.0f} ms" if s else '—'
+
+
+def _mb(n):
+    return f'{n / (1024 * 1024):.1f} MB' if n else 'n/a'
+
+
+class PerformanceTab(QWidget):
+    """Live view of pvmc.perf: phase timings, per-host latency, API counts, stalls, memory.
+
+    Polls once a second, and only while the tab is shown; perf-derived parts are redrawn
+    only when perf.version() moved since the last poll.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._seen_version = -1
+        self._host_rows = {}
+        v = QVBoxLayout(self)
+        grid = QGridLayout()
+        self._labels = {}
+        rows = [
+            ('refresh', 'Refresh (full)'), ('reconcile', 'UI rebuild'), ('layout', 'Layout'),
+            ('redock', 'Redock'), ('stalls', 'Event-loop stalls'), ('rss', 'Memory (RSS)'), ('widgets', 'Widgets'),
+        ]
+        for i, (key, title) in enumerate(rows):
+            grid.addWidget(QLabel(title), i, 0)
+            lbl = QLabel('—')
+            grid.addWidget(lbl, i, 1)
+            self._labels[key] = lbl
+        grid.setColumnStretch(1, 1)
+        v.addLayout(grid)
+        charts = QHBoxLayout()
+        for key, title, color in (('refresh', 'Refresh history', '#4CAF50'), ('reconcile', 'UI rebuild history', '#42A5F5')):
+            col = QVBoxLayout()
+            col.addWidget(QLabel(title))
+            spark = Sparkline(color)
+            col.addWidget(spark)
+            charts.addLayout(col)
+            self._labels[key + '_chart'] = spark
+        v.addLayout(charts)
+        self.host_table = QTableWidget(0, len(_HOST_COLUMNS))
+        self.host_table.setHorizontalHeaderLabels(_HOST_COLUMNS)
+        self.host_table.verticalHeader().setVisible(False)
+        v.addWidget(self.host_table, 1)
+        self.lbl_api = QLabel('')
+        self.lbl_api.setWordWrap(True)
+        v.addWidget(self.lbl_api)
+        btns = QHBoxLayout()
+        btn_export = QPushButton('Export…')
+        btn_export.clicked.connect(self._export)
+        btns.addStretch(1)
+        btns.addWidget(btn_export)
+        v.addLayout(btns)
+        self._timer = QTimer(self)
+        self._timer.setInterval(UPDATE_MS)
+        self._timer.timeout.connect(self._update)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        # Switching tabs or closing the dialog: no polling while nobody is looking
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def _update(self):
+        try:
+            self._update_process()
+            v = perf.version()
+            if v != self._seen_version:
+                self._seen_version = v
+                self._update_perf()
+        except Exception as e:
+            logging.error(f'[UI] Performance tab update failed: {type(e).__name__}: {e}')
+
+    def _update_process(self):
+        self._labels['rss'].setText(_mb(perf.process_rss()))
+        widgets = QApplication.allWidgets()
+        cards = sum(1 for w in widgets if isinstance(w, VMCard))
+        self._labels['widgets'].setText(f'{len(widgets)} total, {cards} VM card(s)')
+
+    def _update_perf(self):
+        for key in ('refresh', 'reconcile', 'layout', 'redock'):
+            s = perf.stats(key)
+            self._labels[key].setText(f"last {_ms(s, 'last')}   p50 {_ms(s, 'p50')}   p95 {_ms(s, 'p95')}   p99 {_ms(s, 'p99')}"
+                                      if s else '—')
+        stall = perf.stats('stall')
+        n = perf.counter('EventLoopStall')
+        self._labels['stalls'].setText(f"{n}   (worst {_ms(stall, 'max')})" if n else '0')
+        self._labels['refresh_chart'].setValues(perf.values('refresh'))
+        self._labels['reconcile_chart'].setValues(perf.values('reconcile'))
+        refreshes = max(1, perf.counter('Refresh'))
+        hosts = sorted((set(perf.hosts('retrieve')) | set(perf.hosts('connect'))) - {''})
+        for host in hosts:
+            row = self._host_rows.get(host)
+            if row is None:
+                row = self.host_table.rowCount()
+                self.host_table.insertRow(row)
+                for col in range(len(_HOST_COLUMNS)):
+                    self.host_table.setItem(row, col, QTableWidgetItem(''))
+                self._host_rows[host] = row
+            ret = perf.stats('retrieve', host)
+            calls = sum(perf.counter(name, host) for name in _API_CALLS if name != 'WaitForUpdatesEx')
+            cells = [host, _ms(perf.stats('connect', host), 'p50'), _ms(ret, 'last'), _ms(ret, 'p50'),
+                     _ms(ret, 'p95'), _ms(ret, 'p99'), _ms(perf.stats('parse', host), 'p50'), f'{calls / refreshes:.1f}']
+            for col, text in enumerate(cells):
+                item = self.host_table.item(row, col)
+                if item.text() != text:
+                    item.setText(text)
+        totals = [f'{name}: {perf.counter(name)}' for name in _API_CALLS if perf.counter(name)]
+        self.lbl_api.setText(f"{perf.counter('Refresh')} full refresh(es). API calls: " + (', '.join(totals) or 'none yet'))
+
+    def _export(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Export Performance Data', f"pvmc_perf_{time.strftime('%Y%m%d_%H%M%S')}.json",
+                                              'JSON (*.json);;All Files (*)')
+        if not path:
+            return
+        data = {
+            'exported_at': time.time(),
+            'rss_bytes': perf.process_rss(),
+            'widgets': len(QApplication.allWidgets()),
+            'perf': perf.snapshot(),
+            'series_ms': {phase: perf.values(phase) for phase in ('refresh', 'reconcile', 'layout', 'redock', 'stall')},
+        }
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            QMessageBox.warning(self, 'Export', f'Could not write {path}: {e}')
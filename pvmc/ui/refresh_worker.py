@@ -0,0 +1,115 @@
+import logging
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+from .. import perf
+from ..snapshot import save_snapshot
+
+
+@dataclass(frozen=True)
+class RefreshResult:
+    """Outcome of one background refresh, handed to the GUI thread and never mutated after.
+
+    vms is None for a metrics-only refresh (push mode), so the caller keeps its cards.
+    """
+    vms: Optional[tuple]
+    host_metrics: tuple
+    failed_hosts: Mapping
+    elapsed: float
+
+
+def running_vms(vms):
+    """The powered-on subset of vms, as shown when show_running_only is set."""
+    return [v for v in vms if str(v.get('power_state', '')).lower() == 'poweredon']
+
+
+class RefreshWorker(QObject):
+    """Runs ESXi collection on a background thread and delivers RefreshResult by signal.
+
+    At most one refresh is in flight. Timer ticks that land while one is running are
+    coalesced into it; forced requests (manual refresh, settings changes) queue exactly one
+    follow-up so the new settings are picked up. Each refresh reads servers and flags from
+    the ConfigSnapshot it was requested with, never from the live config.
+    """
+    finished = Signal(object)
+
+    def __init__(self, esxi, parent=None, snapshot_dir=None):
+        super().__init__(parent)
+        self.esxi = esxi
+        # Where the warm-start snapshot is written after each successful full refresh
+        self.snapshot_dir = snapshot_dir
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pvmc-refresh')
+        self._busy = False
+        self._pending = None
+        self.finished.connect(self._on_finished)
+
+    def is_busy(self):
+        return self._busy
+
+    def request(self, config, metrics_only=False, force=False):
+        """Start a refresh for a ConfigSnapshot; returns False if it was coalesced into the one in flight."""
+        if self._busy:
+            if force:
+                self._pending = (config, metrics_only)
+            logging.debug(f'[INV] Refresh already running; {"queued follow-up" if force else "coalesced timer tick"}')
+            return False
+        self._busy = True
+        self._executor.submit(self._run, config, metrics_only)
+        return True
+
+    def save_snapshot_async(self, vms, host_metrics, failed_hosts):
+        """Write the warm-start snapshot on the worker thread, after any refresh already queued (push mode)."""
+        if self.snapshot_dir:
+            self._executor.submit(save_snapshot, self.snapshot_dir, list(vms), list(host_metrics), dict(failed_hosts))
+
+    def shutdown(self):
+        self._pending = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, config, metrics_only):
+        t0 = time.monotonic()
+        servers = config.servers
+        vms = None
+        metrics = []
+        failed = {}
+        try:
+            if metrics_only:
+                metrics = self.esxi.fetch_hosts_metrics(servers)
+            else:
+                # Fetched unfiltered so the snapshot holds every VM; show_running_only is applied
+                # below for the UI and again when the snapshot is loaded
+                vms, metrics = self.esxi.fetch_inventory_and_metrics(servers, show_running_only=False)
+                failed = dict(self.esxi.last_failed_hosts)
+        except Exception as e:
+            logging.info(f'[INV] FATAL CRASH: {type(e).__name__}: {e}')
+            traceback.print_exc()
+            if not metrics_only:
+                vms = []
+        if vms is not None and self.snapshot_dir and servers and len(failed) < len(servers):
+            # Written here so the GUI thread never does the file I/O
+            save_snapshot(self.snapshot_dir, vms, metrics, failed)
+        if vms and config.get_bool('show_running_only', True):
+            vms = running_vms(vms)
+        result = RefreshResult(
+            vms=tuple(vms) if vms is not None else None,
+            host_metrics=tuple(metrics),
+            failed_hosts=MappingProxyType(failed),
+            elapsed=time.monotonic() - t0,
+        )
+        perf.record('metrics_refresh' if metrics_only else 'refresh', result.elapsed * 1000.0)
+        if not metrics_only:
+            perf.count('Refresh')
+        # Queued to the GUI thread because this QObject lives there
+        self.finished.emit(result)
+
+    def _on_finished(self, _result):
+        self._busy = False
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            self.request(pending[0], metrics_only=pending[1])
@@ -0,0 +1,42 @@
+import logging
+import time
+
+from PySide6.QtCore import QObject, QTimer
+
+from .. import perf
+
+# Heartbeat period on the GUI thread, and how late a beat must be to count as a stall
+BEAT_MS = 200
+STALL_MS = 250
+
+
+class StallProbe(QObject):
+    """Counts event-loop stalls from a GUI-thread heartbeat.
+
+    A QTimer beats every BEAT_MS; when a beat arrives more than STALL_MS late the loop was
+    blocked, and the lateness goes into perf (phase 'stall', counter 'EventLoopStall').
+    last_beat is the monotonic time of the latest beat, readable from other threads.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.last_beat = time.monotonic()
+        self._timer = QTimer(self)
+        self._timer.setInterval(BEAT_MS)
+        self._timer.timeout.connect(self._beat)
+
+    def start(self):
+        self.last_beat = time.monotonic()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def _beat(self):
+        now = time.monotonic()
+        late_ms = (now - self.last_beat) * 1000.0 - BEAT_MS
+        self.last_beat = now
+        if late_ms > STALL_MS:
+            perf.record('stall', late_ms)
+            perf.count('EventLoopStall')
+            logging.debug(f'[UI] Event loop stalled for ~{late_ms:.0f} ms')
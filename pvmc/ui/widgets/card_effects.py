@@ -0,0 +1,182 @@
+import logging
+import math
+
+from PySide6.QtCore import Qt, QObject, QPoint, QRectF, QTimer
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmap
+from PySide6.QtWidgets import QGraphicsBlurEffect, QGraphicsPixmapItem, QGraphicsScene
+
+from ... import tracing
+
+GLOW_COLOR = '#FFD700'
+# Room around the card for the widest blur (24px radius fades out well within this)
+GLOW_PAD = 16
+# Frames per pulse cycle at PULSE_INTERVAL_MS; same ~1.25s period as the old per-card timer
+PULSE_FRAMES = 25
+PULSE_INTERVAL_MS = 50
+
+# Static card shadow: what QGraphicsDropShadowEffect(color=#000, offset=2,2, blur=6) drew per card
+SHADOW_COLOR = '#000000'
+SHADOW_OFFSET = 2
+SHADOW_BLUR = 6
+SHADOW_PAD = 8
+
+_CACHE_LIMIT = 512
+_glow_cache = {}
+_shadow_cache = {}
+
+
+def _blurred(w, h, radius, color, blur, pad, dpr):
+    """Blur a filled rounded-rect silhouette once and return it as a pixmap (pad px around the card)."""
+    src = QImage(int((w + 2 * pad) * dpr), int((h + 2 * pad) * dpr), QImage.Format_ARGB32_Premultiplied)
+    src.fill(Qt.transparent)
+    p = QPainter(src)
+    p.setRenderHint(QPainter.Antialiasing, True)
+    p.scale(dpr, dpr)
+    p.setPen(Qt.NoPen)
+    p.setBrush(color)
+    p.drawRoundedRect(QRectF(pad, pad, w, h), radius, radius)
+    p.end()
+    scene = QGraphicsScene()
+    item = QGraphicsPixmapItem(QPixmap.fromImage(src))
+    eff = QGraphicsBlurEffect()
+    eff.setBlurRadius(blur * dpr)
+    eff.setBlurHints(QGraphicsBlurEffect.QualityHint)
+    item.setGraphicsEffect(eff)
+    scene.addItem(item)
+    out = QImage(src.size(), QImage.Format_ARGB32_Premultiplied)
+    out.fill(Qt.transparent)
+    p = QPainter(out)
+    scene.render(p, QRectF(out.rect()), QRectF(src.rect()))
+    p.end()
+    pm = QPixmap.fromImage(out)
+    pm.setDevicePixelRatio(dpr)
+    return pm
+
+
+def glow_pixmap(w, h, radius, frame, dpr=1.0, color=GLOW_COLOR):
+    """Pre-rendered pulse frame for a w x h card, drawn at card.pos() - (GLOW_PAD, GLOW_PAD)."""
+    frame = int(frame) % PULSE_FRAMES
+    key = (w, h, radius, color, frame, dpr)
+    pm = _glow_cache.get(key)
+    if pm is None:
+        # Blur 12..24 and alpha 90..200 over one sine cycle, as the animated shadow effect did
+        k = 0.5 + 0.5 * math.sin(2 * math.pi * frame / PULSE_FRAMES)
+        col = QColor(color)
+        col.setAlpha(90 + int(110 * k))
+        if len(_glow_cache) >= _CACHE_LIMIT:
+            _glow_cache.clear()
+        pm = _blurred(w, h, radius, col, 12 + int(12 * k), GLOW_PAD, dpr)
+        _glow_cache[key] = pm
+    return pm
+
+
+def shadow_pixmap(w, h, radius, dpr=1.0, color=SHADOW_COLOR):
+    """Pre-blurred card shadow, drawn at card.pos() + SHADOW_OFFSET - SHADOW_PAD; one per size and style."""
+    key = (w, h, radius, color, dpr)
+    pm = _shadow_cache.get(key)
+    if pm is None:
+        if len(_shadow_cache) >= _CACHE_LIMIT:
+            _shadow_cache.clear()
+        pm = _blurred(w, h, radius, QColor(color), SHADOW_BLUR, SHADOW_PAD, dpr)
+        _shadow_cache[key] = pm
+    return pm
+
+
+def shadow_origin(card):
+    return card.pos() + QPoint(SHADOW_OFFSET - SHADOW_PAD, SHADOW_OFFSET - SHADOW_PAD)
+
+
+class PulseClock(QObject):
+    """One timer for every pulsing card in the app.
+
+    Cards register while they pulse; each tick advances a shared frame and asks the card's
+    parent to repaint just the glow area behind it. The timer stops when nothing registered
+    is on screen (hidden or minimized window, card clipped away) and is restarted by wake().
+    """
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.frame = 0
+        self._cards = set()
+        self._timer = QTimer(self)
+        self._timer.setInterval(PULSE_INTERVAL_MS)
+        self._timer.timeout.connect(self._tick)
+
+    def register(self, card):
+        self._cards.add(card)
+        self._repaint_behind(card)
+        self.wake()
+
+    def unregister(self, card):
+        self._cards.discard(card)
+        self._repaint_behind(card)
+        if not self._cards:
+            self._timer.stop()
+
+    def is_pulsing(self, card):
+        return card in self._cards
+
+    def wake(self):
+        if self._cards and not self._timer.isActive():
+            self._timer.start()
+
+    def pause(self):
+        self._timer.stop()
+
+    def is_running(self):
+        return self._timer.isActive()
+
+    def glows_for(self, parent):
+        """(pos, pixmap) for every pulsing child of parent, at the current frame."""
+        out = []
+        for card in list(self._cards):
+            try:
+                if card.parent() is not parent or not card.isVisible():
+                    continue
+                pm = glow_pixmap(card.width(), card.height(), card.corner_radius(), self.frame, card.devicePixelRatioF())
+                out.append((card.pos() - QPoint(GLOW_PAD, GLOW_PAD), pm))
+            except RuntimeError:
+                # Card was deleted without unregistering
+                self._cards.discard(card)
+        return out
+
+    def _on_screen(self, card):
+        if not card.isVisible():
+            return False
+        win = card.window()
+        if win is None or win.isMinimized():
+            return False
+        return not card.visibleRegion().isEmpty()
+
+    def _repaint_behind(self, card):
+        try:
+            parent = card.parentWidget()
+            if parent is not None:
+                parent.update(card.geometry().adjusted(-GLOW_PAD, -GLOW_PAD, GLOW_PAD, GLOW_PAD))
+        except RuntimeError:
+            pass
+
+    def _tick(self):
+        self.frame = (self.frame + 1) % PULSE_FRAMES
+        shown = 0
+        for card in list(self._cards):
+            try:
+                if not self._on_screen(card):
+                    continue
+            except RuntimeError:
+                self._cards.discard(card)
+                continue
+            shown += 1
+            self._repaint_behind(card)
+        if not shown:
+            if tracing.enabled('CARD'):
+                logging.debug(f'[CARD] Pulse clock idle: {len(self._cards)} pulsing card(s), none on screen')
+            self._timer.stop()
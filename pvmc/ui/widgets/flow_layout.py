@@ -5,6 +5,8 @@ import shiboken6
 from PySide6.QtCore import QPoint, QRect, QSize, Qt
 from PySide6.QtWidgets import QLayout, QSizePolicy, QWidgetItem
 
+from ... import tracing
+
 
 class FlowLayout(QLayout):
     def __init__(self, parent=None, margin=6, hspacing=6, vspacing=6):
@@ -102,6 +104,10 @@ class FlowLayout(QLayout):
         x = effective_rect.x()
         y = effective_rect.y()
         lineHeight = 0
+        # Per-item lines only at TRACE; one summary per pass at DEBUG
+        per_item = not testOnly and tracing.enabled('FLOW', tracing.TRACE)
+        placed = 0
+        rows = 1
 
         # Iterate over a copy to avoid concurrent modification issues
         for item in list(self._itemList):
@@ -132,14 +138,20 @@ class FlowLayout(QLayout):
                     hint = wid.sizeHint()
                     nextX = x + hint.width() + spaceX
                     lineHeight = 0
-                    logging.debug(f"[FLOW] wrap -> new row at y={y}")
+                    rows += 1
+                    if per_item:
+                        logging.debug(f"[FLOW] wrap -> new row at y={y}")
                 if not testOnly:
                     wid.setGeometry(QRect(QPoint(x, y), hint))
-                    logging.debug(f"[FLOW] place widget id={id(wid)} pos=({x},{y}) size=({hint.width()}x{hint.height()})")
+                    placed += 1
+                    if per_item:
+                        logging.debug(f"[FLOW] place widget id={id(wid)} pos=({x},{y}) size=({hint.width()}x{hint.height()})")
                 x = nextX
                 lineHeight = max(lineHeight, hint.height())
             except Exception as e:
                 logging.error(f"[FLOW] item layout error: {e}")
                 traceback.print_exc()
 
+        if placed and tracing.enabled('FLOW'):
+            logging.debug(f"[FLOW] layout: {placed} widget(s) in {rows} row(s)")
         return y + lineHeight - rect.y() + b
@@ -2,6 +2,7 @@ from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QFrame, QLabel, QHBoxLayout, QVBoxLayout
 
 from .mini_gauge import MiniGauge
+from ...theme import repolish
 
 
 class HostMetricsCard(QFrame):
@@ -10,29 +11,13 @@ class HostMetricsCard(QFrame):
         self.setObjectName('hostmetricard')
         self.theme = theme
         self.metrics = metrics or {}
-        t = self.theme.active_theme()
-        txt = self.theme.metrics_text_color()
-        # Pastel background derived from server color
-        pastel_bg = None
-        try:
-            col = self.metrics.get('color')
-            light = self.theme.lighten_color(col, 0.6)
-            # hex to rgb
-            r = int(light[1:3], 16)
-            g = int(light[3:5], 16)
-            b = int(light[5:7], 16)
-            pastel_bg = f'rgba({r},{g},{b},80)'
-        except Exception:
-            pastel_bg = 'rgba(255,255,255,36)'
-        self.setStyleSheet(
-            f"QFrame#hostmetricard {{ background: transparent; border: 1px solid rgba(255,255,255,0.18); border-radius: 6px; }}"
-            f" QLabel {{ color: {txt}; font-size: 10px; }}"
-        )
 
         # Header with server label
         hdr = QFrame(self)
         hdr.setObjectName('hostmetrictitle')
-        hdr.setStyleSheet(f"QFrame#hostmetrictitle {{ background: {pastel_bg}; border-top-left-radius: 6px; border-top-right-radius: 6px; }}")
+        # Pastel title background per server color comes from the application stylesheet
+        hdr.setProperty('srv', self.theme.server_class(self.metrics.get('color')))
+        self._hdr = hdr
         lbl = QLabel(self.metrics.get('label') or self.metrics.get('host') or '')
         lbl.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         hl = QHBoxLayout(hdr)
@@ -118,23 +103,10 @@ class HostMetricsCard(QFrame):
         self.setToolTip(f"CPU {cpu:.0f}% • MEM {mem:.0f}% • DISK Free {dfree:.0f}%")
 
     def updateTheme(self):
-        t = self.theme.active_theme()
-        txt = t.get('panel_text', '#FFFFFF')
-        pastel_bg = None
-        try:
-            col = self.metrics.get('color')
-            light = self.theme.lighten_color(col, 0.6)
-            r = int(light[1:3], 16)
-            g = int(light[3:5], 16)
-            b = int(light[5:7], 16)
-            pastel_bg = f'rgba({r},{g},{b},80)'
-        except Exception:
-            pastel_bg = 'rgba(255,255,255,36)'
-        self.setStyleSheet(
-            f"QFrame#hostmetricard {{ background: transparent; border: 1px solid rgba(255,255,255,0.18); border-radius: 6px; }}"
-            f" QFrame#hostmetrictitle {{ background: {pastel_bg}; border-top-left-radius: 6px; border-top-right-radius: 6px; }}"
-            f" QLabel {{ color: {txt}; font-size: 10px; }}"
-        )
+        cls = self.theme.server_class(self.metrics.get('color'))
+        if self._hdr.property('srv') != cls:
+            self._hdr.setProperty('srv', cls)
+            repolish(self._hdr)
         try:
             self.counts.setText(self._counts_html())
         except Exception:
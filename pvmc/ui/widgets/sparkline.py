@@ -0,0 +1,41 @@
+from PySide6.QtCore import Qt, QPointF, QSize
+from PySide6.QtGui import QPainter, QPen, QColor, QPolygonF
+from PySide6.QtWidgets import QWidget
+
+
+class Sparkline(QWidget):
+    """Small line chart of the most recent values, scaled to their own min/max."""
+
+    def __init__(self, color='#4CAF50', max_points=120, parent=None):
+        super().__init__(parent)
+        self._values = []
+        self._color = QColor(color)
+        self._max_points = max_points
+        self.setMinimumSize(160, 36)
+
+    def sizeHint(self):
+        return QSize(240, 40)
+
+    def setValues(self, values):
+        values = list(values)[-self._max_points:]
+        if values != self._values:
+            self._values = values
+            self.update()
+
+    def paintEvent(self, event):
+        if len(self._values) < 2:
+            return
+        p = QPainter(self)
+        p.setRenderHint(QPainter.Antialiasing, True)
+        w = self.width() - 4
+        h = self.height() - 4
+        lo = min(self._values)
+        hi = max(self._values)
+        span = (hi - lo) or 1.0
+        step = w / (len(self._values) - 1)
+        pts = QPolygonF([QPointF(2 + i * step, 2 + h - (v - lo) / span * h) for i, v in enumerate(self._values)])
+        pen = QPen(self._color, 1.5)
+        pen.setCapStyle(Qt.RoundCap)
+        p.setPen(pen)
+        p.drawPolyline(pts)
+        p.end()
@@ -1,9 +1,12 @@
 import logging
-import math
 
-from PySide6.QtCore import Qt, QSize, QTimer
-from PySide6.QtGui import QAction, QFontMetrics, QColor
-from PySide6.QtWidgets import QFrame, QLabel, QHBoxLayout, QVBoxLayout, QMenu, QGraphicsDropShadowEffect
+from PySide6.QtCore import Qt, QSize
+from PySide6.QtGui import QAction, QFontMetrics
+from PySide6.QtWidgets import QFrame, QLabel, QHBoxLayout, QVBoxLayout, QMenu
+
+from .card_effects import PulseClock
+from ... import tracing
+from ...theme import repolish
 
 
 class ElideLabel(QLabel):
@@ -14,7 +17,10 @@ class ElideLabel(QLabel):
 
     def setText(self, text):
         self._full = text
-        super().setText(text)
+        if self.width() > 0:
+            super().setText(QFontMetrics(self.font()).elidedText(text, self._mode, self.width()))
+        else:
+            super().setText(text)
 
     def resizeEvent(self, event):
         try:
@@ -28,13 +34,17 @@ class ElideLabel(QLabel):
 
 
 class Led(QLabel):
-    def __init__(self, color='#4CAF50', parent=None):
+    # Colors come from the application stylesheet: QLabel#led and QLabel#led[powered="true"]
+    def __init__(self, powered=False, parent=None):
         super().__init__('', parent)
+        self.setObjectName('led')
         self.setFixedSize(QSize(10, 10))
-        self.set_color(color)
+        self.setProperty('powered', bool(powered))
 
-    def set_color(self, color):
-        self.setStyleSheet(f'background: {color}; border-radius: 5px;')
+    def set_powered(self, on):
+        if self.property('powered') != bool(on):
+            self.setProperty('powered', bool(on))
+            repolish(self)
 
 
 class VMCard(QFrame):
@@ -49,13 +59,15 @@ class VMCard(QFrame):
         self.on_reboot = on_reboot
         name_u = (vm.get('name','') or '').upper()
         self.is_important = ('IMPORTANT' in name_u) or ('(I)' in name_u)
-        on_color = self.theme.led_color_on()
         powered_on = (vm.get('power_state','').lower()=="poweredon")
-        self.led = Led(on_color if powered_on else '#666666')
+        # Server color and IMPORTANT are properties the application stylesheet selects on
+        self.setProperty('srv', self.theme.server_class(vm.get('server_color')))
+        self.setProperty('important', self.is_important)
+        self.led = Led(powered_on)
         self.name = ElideLabel(vm.get('name',''))
         # Prefer custom server label if present
         self.server = QLabel(vm.get('server_label', vm.get('server','')))
-        self.server.setStyleSheet(f'color: {self.theme.active_theme().get("vm_server_text", "#AAAAAA")}; font-size: 10px;')
+        self.server.setObjectName('vmserver')
         v = QVBoxLayout()
         v.setContentsMargins(8, 6, 8, 6)
         v.setSpacing(0)
@@ -71,26 +83,16 @@ class VMCard(QFrame):
         leds.addWidget(self.led, 0, Qt.AlignTop)
         h.addLayout(leds)
         h.addLayout(v)
-        eff = QGraphicsDropShadowEffect(self)
-        self._shadow_effect = eff
-        self.setGraphicsEffect(self._shadow_effect)
+        # No QGraphicsEffect: the parent panel paints the shadow (or pulse glow) from a pixmap cache
         self.setCursor(Qt.PointingHandCursor)
         try:
-            hsize = self.sizeHint()
-            logging.debug(f"[CARD] Built VMCard name='{vm.get('name')}' server='{vm.get('server')}' moid='{vm.get('moid')}' sizeHint=({hsize.width()}x{hsize.height()})")
+            # sizeHint() runs the card's layout; only pay for it when per-card tracing is on
+            if tracing.enabled('CARD', tracing.TRACE):
+                hsize = self.sizeHint()
+                logging.debug(f"[CARD] Built VMCard name='{vm.get('name')}' server='{vm.get('server')}' moid='{vm.get('moid')}' sizeHint=({hsize.width()}x{hsize.height()})")
         except Exception as e:
             logging.error(f"[CARD] sizeHint error: {type(e).__name__}: {e}")
-        # Apply initial style with optional server color override; lighten if IMPORTANT
-        try:
-            bg_override = vm.get('server_color')
-            if self.is_important:
-                bg_override = self.theme.lighten_color(bg_override, 0.25)
-            self.setStyleSheet(self.theme.vm_button_style_for(bg_override))
-        except Exception:
-            self.setStyleSheet(self.theme.vm_button_style())
-        # Initialize pulsing state and apply initial glow state
-        self._pulse_timer = None
-        self._pulse_theta = 0.0
+        # Apply initial glow state; the pulse itself is driven by the shared PulseClock
         try:
             self._update_glow_state(powered_on)
         except Exception:
@@ -123,71 +125,63 @@ class VMCard(QFrame):
         m.exec(event.globalPos())
 
     def updateTheme(self):
-        self.server.setStyleSheet(f'color: {self.theme.active_theme().get("vm_server_text", "#AAAAAA")}; font-size: 10px;')
-        bg_override = self.vm.get('server_color')
-        if self.is_important:
-            bg_override = self.theme.lighten_color(bg_override, 0.25)
-        self.setStyleSheet(self.theme.vm_button_style_for(bg_override))
-        # Reapply glow based on current power state
+        # Styling follows the application stylesheet; only the style properties and glow are refreshed
+        self.setProperty('srv', self.theme.server_class(self.vm.get('server_color')))
+        self.setProperty('important', self.is_important)
+        repolish(self)
         try:
             powered_on = (self.vm.get('power_state','').lower()=="poweredon")
+            self.led.set_powered(powered_on)
             self._update_glow_state(powered_on)
         except Exception:
             pass
 
+    def update_vm(self, vm):
+        """Apply a newer record for the same VM without rebuilding the card.
+
+        Only what changed is touched; the card is repolished only when the server color
+        or the IMPORTANT flag changed.
+        """
+        old = self.vm
+        self.vm = vm
+        restyle = vm.get('server_color') != old.get('server_color')
+        if vm.get('name') != old.get('name'):
+            self.name.setText(vm.get('name', ''))
+            name_u = (vm.get('name', '') or '').upper()
+            important = ('IMPORTANT' in name_u) or ('(I)' in name_u)
+            if important != self.is_important:
+                self.is_important = important
+                restyle = True
+        label = vm.get('server_label', vm.get('server', ''))
+        if label != old.get('server_label', old.get('server', '')):
+            self.server.setText(label)
+        was_on = (old.get('power_state', '').lower() == "poweredon")
+        is_on = (vm.get('power_state', '').lower() == "poweredon")
+        if restyle:
+            self.updateTheme()
+        elif was_on != is_on:
+            self.setPowered(is_on)
+
     def setPowered(self, on):
-        self.led.set_color(self.theme.led_color_on() if on else '#666666')
+        self.led.set_powered(on)
         # Apply or remove pulsing yellow glow for IMPORTANT
         try:
             self._update_glow_state(on)
         except Exception:
             pass
 
+    def corner_radius(self):
+        return self.theme.resolved().radius
+
+    def has_shadow(self):
+        # Pulsing cards show the glow instead of the drop shadow
+        return not PulseClock.instance().is_pulsing(self)
+
     def _update_glow_state(self, powered_on=None):
         if powered_on is None:
             powered_on = (self.vm.get('power_state','').lower()=="poweredon")
         if not self.is_important or powered_on:
-            self._stop_pulse()
-            try:
-                self._shadow_effect.setColor(QColor('#000000'))
-                self._shadow_effect.setOffset(2, 2)
-                self._shadow_effect.setBlurRadius(6)
-            except Exception:
-                pass
+            PulseClock.instance().unregister(self)
             return
-        # IMPORTANT and powered off -> pulsing yellow glow
-        self._start_pulse()
-
-    def _start_pulse(self):
-        if self._pulse_timer is not None:
-            if self._pulse_timer.isActive():
-                return
-        self._pulse_theta = 0.0
-        if self._pulse_timer is None:
-            self._pulse_timer = QTimer(self)
-            self._pulse_timer.setInterval(50)  # ~20 FPS
-            self._pulse_timer.timeout.connect(self._tick_pulse)
-        self._pulse_timer.start()
-
-    def _stop_pulse(self):
-        try:
-            if self._pulse_timer is not None:
-                self._pulse_timer.stop()
-        except Exception:
-            pass
-
-    def _tick_pulse(self):
-        try:
-            # Smooth pulse 0..1
-            self._pulse_theta = (self._pulse_theta + 0.25) % (2 * math.pi)
-            k = 0.5 + 0.5 * math.sin(self._pulse_theta)
-            # Blur between 12..24, alpha between 90..200
-            blur = 12 + int(12 * k)
-            alpha = 90 + int(110 * k)
-            col = QColor('#FFD700')
-            col.setAlpha(alpha)
-            self._shadow_effect.setColor(col)
-            self._shadow_effect.setOffset(0, 0)
-            self._shadow_effect.setBlurRadius(blur)
-        except Exception:
-            pass
+        # IMPORTANT and powered off -> pulsing yellow glow, painted behind the card by the parent panel
+        PulseClock.instance().register(self)
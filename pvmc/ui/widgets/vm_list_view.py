@@ -0,0 +1,236 @@
+import logging
+
+from PySide6.QtCore import Qt, QAbstractListModel, QRectF, QSize
+from PySide6.QtGui import QAction, QColor, QFont, QFontMetrics, QPainter, QPen
+from PySide6.QtWidgets import QListView, QMenu, QStyledItemDelegate, QAbstractItemView
+
+VM_ROLE = Qt.UserRole + 1
+
+
+def _vm_key(vm):
+    return (vm.get('server'), vm.get('moid'))
+
+
+def _is_important(vm):
+    name_u = (vm.get('name', '') or '').upper()
+    return ('IMPORTANT' in name_u) or ('(I)' in name_u)
+
+
+def _is_on(vm):
+    return vm.get('power_state', '').lower() == "poweredon"
+
+
+class VMListModel(QAbstractListModel):
+    """Flat list of VM dicts; same-membership updates only signal the rows that changed."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._vms = []
+        self._keys = []
+
+    def rowCount(self, parent=None):
+        return 0 if parent is not None and parent.isValid() else len(self._vms)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._vms):
+            return None
+        vm = self._vms[index.row()]
+        if role == VM_ROLE:
+            return vm
+        if role == Qt.DisplayRole:
+            return vm.get('name', '')
+        if role == Qt.ToolTipRole:
+            return f"{vm.get('name', '')}\n{vm.get('server_label', vm.get('server', ''))}"
+        return None
+
+    def vm_at(self, row):
+        return self._vms[row] if 0 <= row < len(self._vms) else None
+
+    def set_vms(self, vms):
+        """Returns True when membership or order changed (rows were reset)."""
+        vms = list(vms)
+        keys = [_vm_key(v) for v in vms]
+        if keys != self._keys:
+            self.beginResetModel()
+            self._vms = vms
+            self._keys = keys
+            self.endResetModel()
+            return True
+        old = self._vms
+        self._vms = vms
+        changed = [row for row, (a, b) in enumerate(zip(old, vms)) if a != b]
+        if changed:
+            # One signal spanning the changed rows; the view repaints only what is visible
+            self.dataChanged.emit(self.index(changed[0]), self.index(changed[-1]))
+        return False
+
+
+class VMCardDelegate(QStyledItemDelegate):
+    """Paints a VM card (LED, name, server label, server color / IMPORTANT styling) in place of a VMCard widget."""
+
+    def __init__(self, theme, parent=None):
+        super().__init__(parent)
+        self.theme = theme
+        self.card_size = QSize(160, 48)
+        self._colors = {}
+        self.refresh_theme()
+
+    def refresh_theme(self):
+        self._radius = self.theme.resolved().radius
+        self._name_color = self.theme.qcolor('vm_name_text')
+        self._server_color = self.theme.qcolor('vm_server_text')
+        self._led_on = self.theme.qcolor('led_on')
+        self._led_off = self.theme.qcolor('led_off')
+        self._default_bg = self.theme.color('button_bg')
+        self._colors.clear()
+
+    def _bg_for(self, vm, important):
+        key = (vm.get('server_color'), important)
+        c = self._colors.get(key)
+        if c is None:
+            bg = vm.get('server_color')
+            if important:
+                bg = self.theme.lighten_color(bg, 0.25)
+            c = QColor(bg or self._default_bg)
+            self._colors[key] = c
+        return c
+
+    def sizeHint(self, option, index):
+        return self.card_size
+
+    def paint(self, p, option, index):
+        vm = index.data(VM_ROLE)
+        if not vm:
+            return
+        try:
+            p.save()
+            p.setRenderHint(QPainter.Antialiasing, True)
+            important = _is_important(vm)
+            on = _is_on(vm)
+            r = QRectF(option.rect).adjusted(0, 0, -2, -2)
+            if important and not on:
+                # Static stand-in for the card's pulsing glow
+                glow = QColor('#FFD700')
+                glow.setAlpha(160)
+                p.setPen(QPen(glow, 3))
+                p.setBrush(Qt.NoBrush)
+                p.drawRoundedRect(r.adjusted(-1, -1, 1, 1), self._radius + 1, self._radius + 1)
+            else:
+                shadow = QColor(0, 0, 0, 90)
+                p.setPen(Qt.NoPen)
+                p.setBrush(shadow)
+                p.drawRoundedRect(r.translated(2, 2), self._radius, self._radius)
+            p.setPen(Qt.NoPen)
+            p.setBrush(self._bg_for(vm, important))
+            p.drawRoundedRect(r, self._radius, self._radius)
+            # Same geometry as VMCard: 8/6 margins, 10px LED, text column after 8px gap
+            p.setBrush(self._led_on if on else self._led_off)
+            p.drawEllipse(QRectF(r.x() + 8, r.y() + 6, 10, 10))
+            tx = r.x() + 8 + 10 + 8 + 8
+            tw = max(0, int(r.right() - 8 - 8 - tx))
+            f = QFont(option.font)
+            p.setFont(f)
+            fm = QFontMetrics(f)
+            p.setPen(self._name_color)
+            name = fm.elidedText(vm.get('name', '') or '', Qt.ElideLeft, tw)
+            ty = r.y() + 6 + 6
+            p.drawText(QRectF(tx, ty, tw, fm.height()), Qt.AlignLeft | Qt.AlignVCenter, name)
+            sf = QFont(option.font)
+            sf.setPixelSize(10)
+            p.setFont(sf)
+            p.setPen(self._server_color)
+            sfm = QFontMetrics(sf)
+            label = sfm.elidedText(vm.get('server_label', vm.get('server', '')) or '', Qt.ElideRight, tw)
+            p.drawText(QRectF(tx, ty + fm.height(), tw, sfm.height()), Qt.AlignLeft | Qt.AlignVCenter, label)
+        except Exception as e:
+            logging.error(f"[CARD] paint error: {type(e).__name__}: {e}")
+        finally:
+            p.restore()
+
+
+class VMListView(QListView):
+    """Virtualized VM area: one list view whose delegate paints only the cards in the viewport.
+
+    Offers the same click-to-console and context menu as VMCard, for fleets too large to
+    give every VM its own widget.
+    """
+
+    def __init__(self, theme, on_console, on_start, on_stop, on_reboot=None, parent=None, margin=8, hspacing=8, vspacing=8):
+        super().__init__(parent)
+        self.theme = theme
+        self.on_console = on_console
+        self.on_start = on_start
+        self.on_stop = on_stop
+        self.on_reboot = on_reboot
+        # Same spacing attributes as WrapPanel so the dock math works for either view
+        self.margin = margin
+        self.hspacing = hspacing
+        self.vspacing = vspacing
+        self._model = VMListModel(self)
+        self._delegate = VMCardDelegate(theme, self)
+        self.setModel(self._model)
+        self.setItemDelegate(self._delegate)
+        self.setViewMode(QListView.ListMode)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(200)
+        self.setSpacing(max(hspacing, vspacing) // 2)
+        self.setViewportMargins(margin - self.spacing(), margin - self.spacing(), 0, 0)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameShape(QListView.NoFrame)
+        self.setObjectName('vmList')
+        self.viewport().setAutoFillBackground(False)
+        self.viewport().setCursor(Qt.PointingHandCursor)
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.customContextMenuRequested.connect(self._show_menu)
+        self.clicked.connect(self._on_clicked)
+
+    def count(self):
+        return self._model.rowCount()
+
+    def setVms(self, vms, card_size=None):
+        """Show vms; returns True when rows were added, removed or reordered."""
+        resized = False
+        if card_size is not None and card_size != self._delegate.card_size:
+            self._delegate.card_size = QSize(card_size)
+            resized = True
+        changed = self._model.set_vms(vms)
+        if resized and not changed:
+            self.scheduleDelayedItemsLayout()
+        return changed or resized
+
+    def updateTheme(self):
+        self._delegate.refresh_theme()
+        self.viewport().update()
+
+    def _on_clicked(self, index):
+        vm = self._model.vm_at(index.row())
+        if vm is not None and callable(self.on_console):
+            self.on_console(vm)
+
+    def _show_menu(self, pos):
+        vm = self._model.vm_at(self.indexAt(pos).row())
+        if vm is None:
+            return
+        m = QMenu(self)
+        act_console = QAction('Remote Console', m)
+        act_console.triggered.connect(lambda: self.on_console(vm))
+        act_start = QAction('Start VM', m)
+        act_start.triggered.connect(lambda: self.on_start(vm))
+        act_stop = QAction('Guest Shutdown', m)
+        act_stop.triggered.connect(lambda: self.on_stop(vm))
+        m.addAction(act_console)
+        m.addSeparator()
+        m.addAction(act_start)
+        m.addAction(act_stop)
+        if callable(self.on_reboot):
+            act_restart = QAction('Guest Restart', m)
+            act_restart.triggered.connect(lambda: self.on_reboot(vm))
+            m.addAction(act_restart)
+        m.exec(self.viewport().mapToGlobal(pos))
@@ -8,9 +8,6 @@ class VMResourceChip(QFrame):
         self.setObjectName('vmreschip')
         self.theme = theme
         self.vm = vm
-        t = self.theme.active_theme()
-        txt = t.get('panel_text', '#FFFFFF')
-        self.setStyleSheet(f"QFrame#vmreschip {{ background: transparent; }} QLabel {{ color: {txt}; font-size: 10px; }}")
         name = vm.get('name', '')
         res = vm.get('res') or {}
         cpu = res.get('cpu_mhz', 0)
@@ -30,6 +27,5 @@ class VMResourceChip(QFrame):
         h.addWidget(self.lbl_disk, 0, Qt.AlignVCenter)
 
     def updateTheme(self):
-        t = self.theme.active_theme()
-        txt = t.get('panel_text', '#FFFFFF')
-        self.setStyleSheet(f"QFrame#vmreschip {{ background: transparent; }} QLabel {{ color: {txt}; font-size: 10px; }}")
+        # Styled by the application stylesheet (QFrame#vmreschip)
+        pass
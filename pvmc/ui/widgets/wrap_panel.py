@@ -1,9 +1,14 @@
 import logging
+import time
 import traceback
 
 from PySide6.QtCore import QRect, QPoint, QSize
+from PySide6.QtGui import QPainter
 from PySide6.QtWidgets import QWidget
 
+from .card_effects import PulseClock, shadow_origin, shadow_pixmap
+from ... import perf, tracing
+
 
 class WrapPanel(QWidget):
     def __init__(self, parent=None, margin=8, hspacing=8, vspacing=8):
@@ -13,29 +18,59 @@ class WrapPanel(QWidget):
         self.vspacing = vspacing
         self.setContentsMargins(margin, margin, margin, margin)
         self._children = []
+        # Nesting depth of beginBatch(); layout is deferred to the outermost endBatch()
+        self._batch_depth = 0
+        self._batch_dirty = False
+
+    def beginBatch(self):
+        """Defer layout until the matching endBatch(), so n inserts cost one layout pass."""
+        self._batch_depth += 1
+
+    def endBatch(self):
+        if self._batch_depth <= 0:
+            return
+        self._batch_depth -= 1
+        if self._batch_depth == 0 and self._batch_dirty:
+            self._relayout()
+
+    def _relayout(self):
+        if self._batch_depth > 0:
+            self._batch_dirty = True
+            return
+        self._batch_dirty = False
+        self._layout_children()
+        self.update()
 
     def addWidget(self, w):
         try:
             w.setParent(self)
             w.show()
             self._children.append(w)
-            self._layout_children()
-            self.update()
+            self._relayout()
         except Exception as e:
             logging.error(f"[WRAP] addWidget error: {type(e).__name__}: {e}")
             traceback.print_exc()
 
+    def addWidgets(self, widgets):
+        """Append many widgets with a single layout pass."""
+        self.beginBatch()
+        try:
+            for w in widgets:
+                self.addWidget(w)
+        finally:
+            self.endBatch()
+
     def clear(self):
         try:
             for w in self._children:
                 try:
+                    PulseClock.instance().unregister(w)
                     w.setParent(None)
                     w.deleteLater()
                 except Exception:
                     pass
             self._children.clear()
-            self._layout_children()
-            self.update()
+            self._relayout()
         except Exception as e:
             logging.error(f"[WRAP] clear error: {type(e).__name__}: {e}")
             traceback.print_exc()
@@ -43,6 +78,32 @@ class WrapPanel(QWidget):
     def count(self):
         return len(self._children)
 
+    def widgets(self):
+        return list(self._children)
+
+    def setWidgets(self, widgets):
+        """Replace the child order in one go (new widgets are adopted) and lay out once."""
+        try:
+            widgets = list(widgets)
+            keep = set(id(w) for w in widgets)
+            for w in self._children:
+                if id(w) not in keep:
+                    try:
+                        PulseClock.instance().unregister(w)
+                        w.setParent(None)
+                        w.deleteLater()
+                    except Exception:
+                        pass
+            for w in widgets:
+                if w.parent() is not self:
+                    w.setParent(self)
+                    w.show()
+            self._children = widgets
+            self._relayout()
+        except Exception as e:
+            logging.error(f"[WRAP] setWidgets error: {type(e).__name__}: {e}")
+            traceback.print_exc()
+
     def _children_iter(self):
         for w in self._children:
             if w is None:
@@ -53,41 +114,102 @@ class WrapPanel(QWidget):
 
     def _layout_children(self):
         try:
+            t0 = time.perf_counter()
             m = self.contentsMargins()
             l, t, r, b = m.left(), m.top(), m.right(), m.bottom()
             area = self.rect().adjusted(l, t, -r, -b)
-            x = area.x()
-            y = area.y()
-            line_h = 0
-            right = area.right()
-            for w in self._children_iter():
-                try:
-                    sz = w.size()
-                    if sz.width() <= 0 or sz.height() <= 0:
-                        hint = w.sizeHint()
-                        w_w = max(1, hint.width())
-                        w_h = max(1, hint.height())
-                    else:
-                        w_w = sz.width()
-                        w_h = sz.height()
-                    next_x = x + w_w + self.hspacing
-                    if next_x - self.hspacing > right and line_h > 0:
-                        x = area.x()
-                        y = y + line_h + self.vspacing
-                        next_x = x + w_w + self.hspacing
-                        line_h = 0
-                        logging.debug(f"[WRAP] wrap -> new row at y={y}")
-                    w.setGeometry(QRect(QPoint(x, y), QSize(w_w, w_h)))
-                    logging.debug(f"[WRAP] place widget id={id(w)} pos=({x},{y}) size=({w_w}x{w_h})")
-                    x = next_x
-                    line_h = max(line_h, w_h)
-                except Exception as e:
-                    logging.error(f"[WRAP] item layout error: {type(e).__name__}: {e}")
-                    traceback.print_exc()
+            items = list(self._children_iter())
+            if not items:
+                return
+            size = items[0].size()
+            uniform = size.width() > 0 and size.height() > 0 and all(w.size() == size for w in items)
+            if uniform:
+                rows = self._layout_uniform(items, area, size)
+            else:
+                rows = self._layout_flow(items, area)
+            ms = (time.perf_counter() - t0) * 1000
+            perf.record('layout', ms)
+            if tracing.enabled('WRAP'):
+                logging.debug(f"[WRAP] layout: {len(items)} item(s) in {rows} row(s) uniform={uniform} {ms:.1f}ms")
+            # Cards may have moved back on screen; restart the pulse if it went idle
+            PulseClock.instance().wake()
         except Exception as e:
             logging.error(f"[WRAP] layout error: {type(e).__name__}: {e}")
             traceback.print_exc()
 
+    def _layout_uniform(self, items, area, size):
+        # Fixed-size cards (what rebuild_ui creates): each slot is pure arithmetic
+        w_w, w_h = size.width(), size.height()
+        step_x = w_w + self.hspacing
+        step_y = w_h + self.vspacing
+        # Same wrap rule as _layout_flow: an item fits while its right edge stays within area.right()
+        cols = max(1, (area.width() - 1 + self.hspacing) // step_x)
+        x0, y0 = area.x(), area.y()
+        for i, w in enumerate(items):
+            row, col = divmod(i, cols)
+            pos = QPoint(x0 + col * step_x, y0 + row * step_y)
+            if w.pos() != pos:
+                w.move(pos)
+        return (len(items) + cols - 1) // cols
+
+    def _layout_flow(self, items, area):
+        x = area.x()
+        y = area.y()
+        line_h = 0
+        rows = 1
+        right = area.right()
+        for w in items:
+            try:
+                sz = w.size()
+                if sz.width() <= 0 or sz.height() <= 0:
+                    hint = w.sizeHint()
+                    w_w = max(1, hint.width())
+                    w_h = max(1, hint.height())
+                else:
+                    w_w = sz.width()
+                    w_h = sz.height()
+                next_x = x + w_w + self.hspacing
+                if next_x - self.hspacing > right and line_h > 0:
+                    x = area.x()
+                    y = y + line_h + self.vspacing
+                    next_x = x + w_w + self.hspacing
+                    line_h = 0
+                    rows += 1
+                w.setGeometry(QRect(QPoint(x, y), QSize(w_w, w_h)))
+                x = next_x
+                line_h = max(line_h, w_h)
+            except Exception as e:
+                logging.error(f"[WRAP] item layout error: {type(e).__name__}: {e}")
+                traceback.print_exc()
+        return rows
+
+    def paintEvent(self, event):
+        # Card shadows and pulse glows sit behind their cards and extend past them, so the
+        # panel draws them from cached pixmaps instead of a QGraphicsEffect per card
+        clip = event.rect()
+        p = None
+        for w in self._children:
+            try:
+                if not w.isVisible() or not getattr(w, 'has_shadow', None) or not w.has_shadow():
+                    continue
+                pos = shadow_origin(w)
+                pm = shadow_pixmap(w.width(), w.height(), w.corner_radius(), w.devicePixelRatioF())
+                if not clip.intersects(QRect(pos, pm.deviceIndependentSize().toSize())):
+                    continue
+                if p is None:
+                    p = QPainter(self)
+                p.drawPixmap(pos, pm)
+            except Exception as e:
+                logging.error(f"[WRAP] shadow paint error: {type(e).__name__}: {e}")
+        for pos, pm in PulseClock.instance().glows_for(self):
+            if clip.intersects(QRect(pos, pm.deviceIndependentSize().toSize())):
+                if p is None:
+                    p = QPainter(self)
+                p.drawPixmap(pos, pm)
+        if p is not None:
+            p.end()
+        super().paintEvent(event)
+
     def resizeEvent(self, event):
         self._layout_children()
         super().resizeEvent(event)
@@ -0,0 +1,110 @@
+import logging
+import sys
+import threading
+import time
+import traceback
+
+# Frames kept from the stalled thread's stack, innermost last
+STACK_LIMIT = 25
+# At most one logged report per stack within this many seconds (all stalls are still tallied)
+REPORT_INTERVAL_S = 30.0
+# Stack signatures kept for the diagnostics table
+MAX_PATHS = 50
+
+_lock = threading.Lock()
+_paths = {}
+
+
+def _record_path(stack, ms):
+    with _lock:
+        entry = _paths.get(stack)
+        if entry is None:
+            if len(_paths) >= MAX_PATHS:
+                # Forget the least costly path to make room
+                _paths.pop(min(_paths, key=lambda k: _paths[k]['total_ms']))
+            entry = _paths[stack] = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'last_report': 0.0, 'suppressed': 0}
+        entry['count'] += 1
+        entry['total_ms'] += ms
+        entry['max_ms'] = max(entry['max_ms'], ms)
+        return entry
+
+
+def worst_paths(n=10):
+    """[(stack, {count, total_ms, max_ms})] sorted by total time blocked, worst first."""
+    with _lock:
+        items = [(k, dict(v)) for k, v in _paths.items()]
+    items.sort(key=lambda kv: kv[1]['total_ms'], reverse=True)
+    return items[:n]
+
+
+def report_text(n=10):
+    """Plain-text list of the worst UI-blocking stacks, for the diagnostics bundle."""
+    paths = worst_paths(n)
+    lines = ['== Event-loop stalls by main-thread stack (worst first) ==']
+    if not paths:
+        lines.append('none recorded')
+    for i, (stack, s) in enumerate(paths, 1):
+        lines.append(f"#{i}: {s['count']} stall(s), {s['total_ms']:.0f} ms total, worst {s['max_ms']:.0f} ms")
+        lines.append(stack.rstrip())
+        lines.append('')
+    return '\n'.join(lines)
+
+
+class StallWatchdog(threading.Thread):
+    """Watches the GUI thread's heartbeat from a background thread.
+
+    heartbeat() returns the monotonic time of the GUI thread's latest beat, which is expected
+    every beat_ms. Once a beat is more than threshold_ms overdue, the GUI thread's Python
+    stack is captured while it is still blocked. When beats resume the stall's duration is
+    tallied per stack and, rate-limited per stack, logged as a warning so it lands in the
+    diagnostics buffer.
+    """
+
+    def __init__(self, heartbeat, thread_id, beat_ms, threshold_ms=500, poll_ms=50):
+        super().__init__(name='pvmc-watchdog', daemon=True)
+        self.heartbeat = heartbeat
+        self.thread_id = thread_id
+        self.beat_ms = float(beat_ms)
+        self.threshold_ms = float(threshold_ms)
+        self.poll_s = poll_ms / 1000.0
+        self._quit = threading.Event()
+
+    def stop(self):
+        self._quit.set()
+
+    def _capture(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return '(main thread stack unavailable)\n'
+        return ''.join(traceback.format_stack(frame, limit=STACK_LIMIT))
+
+    def run(self):
+        stalled_since = None
+        stack = None
+        while not self._quit.wait(self.poll_s):
+            try:
+                beat = self.heartbeat()
+                overdue_ms = (time.monotonic() - beat) * 1000.0 - self.beat_ms
+                if stalled_since is None:
+                    if overdue_ms > self.threshold_ms:
+                        stalled_since = beat
+                        stack = self._capture()
+                elif beat != stalled_since:
+                    # Beats resumed: the stall lasted from the last good beat to this one, less one period
+                    self._report(stack, (beat - stalled_since) * 1000.0 - self.beat_ms)
+                    stalled_since = None
+                    stack = None
+            except Exception as e:
+                logging.error(f'[UI] Watchdog error: {type(e).__name__}: {e}')
+
+    def _report(self, stack, ms):
+        entry = _record_path(stack, ms)
+        now = time.monotonic()
+        with _lock:
+            if now - entry['last_report'] < REPORT_INTERVAL_S:
+                entry['suppressed'] += 1
+                return
+            suppressed, entry['suppressed'] = entry['suppressed'], 0
+            entry['last_report'] = now
+        extra = f' (+{suppressed} more on this path since the last report)' if suppressed else ''
+        logging.warning(f'[UI] GUI thread blocked for {ms:.0f} ms{extra}; it was in:\n{stack.rstrip()}')
@@ -0,0 +1,141 @@
+import logging
+import threading
+import traceback
+
+try:
+    from pyVmomi import vim, vmodl
+except Exception:
+    vim = None
+    vmodl = None
+
+from . import perf
+from .session_pool import session_lost_errors
+from .inventory import VM_PROPERTIES, build_vm_record, container_filter_spec, moid_of
+
+# WaitForUpdatesEx long-poll length, and the socket timeout a watcher's session needs to outlast it
+MAX_WAIT_S = 20
+HTTP_TIMEOUT_S = MAX_WAIT_S + 30.0
+
+
+class HostWatcher(threading.Thread):
+    """Follows one host's VM inventory with WaitForUpdatesEx and reports only what changed.
+
+    on_event is called from this thread with a dict:
+      {'kind': 'resync', 'host': host, 'vms': [record, ...]}            full picture for the host
+      {'kind': 'delta', 'host': host, 'vms': [record, ...], 'removed': [moid, ...]}
+    A resync is sent after the first wait, after a reconnect and after a collector version gap;
+    everything in between is a delta carrying just the VMs whose watched properties changed.
+    """
+
+    def __init__(self, sessions, server, on_event, max_wait=MAX_WAIT_S, retry_delay=10.0):
+        super().__init__(name=f"pvmc-watch-{server.get('host')}", daemon=True)
+        self.sessions = sessions
+        self.server = dict(server)
+        self.on_event = on_event
+        self.max_wait = int(max_wait)
+        if sessions.http_timeout and self.max_wait >= sessions.http_timeout - 5:
+            # The socket would time out while the server is still holding the poll open
+            self.max_wait = max(1, int(sessions.http_timeout) - 5)
+            logging.warning(f"[INV] watch {server.get('host')}: max_wait clamped to {self.max_wait}s under the {sessions.http_timeout:.0f}s socket timeout")
+        self.retry_delay = float(retry_delay)
+        self._quit = threading.Event()
+        self._pc = None
+
+    def stop(self):
+        self._quit.set()
+        pc = self._pc
+        if pc is not None:
+            try:
+                pc.CancelWaitForUpdates()
+            except Exception:
+                pass
+
+    def run(self):
+        host = self.server.get('host')
+        while not self._quit.is_set():
+            try:
+                self._watch()
+            except Exception as e:
+                if self._quit.is_set():
+                    break
+                logging.info(f'[INV] watch {host}: {type(e).__name__}: {e}; retrying in {self.retry_delay:.0f}s')
+                if isinstance(e, session_lost_errors()):
+                    self.sessions.invalidate(host, self.server.get('username'))
+                self._quit.wait(self.retry_delay)
+
+    def _watch(self):
+        PC = vmodl.query.PropertyCollector
+        s = self.server
+        host = s.get('host')
+        si = self.sessions.acquire(host, s.get('username'), s.get('password'))
+        content = si.RetrieveContent()
+        # Private collector so our filter and version never interfere with other callers
+        pc = content.propertyCollector.CreatePropertyCollector()
+        view = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
+        self._pc = pc
+        try:
+            pc.CreateFilter(container_filter_spec(view, {vim.VirtualMachine: VM_PROPERTIES}), partialUpdates=True)
+            logging.info(f'[INV] watch {host}: filter installed; waiting for updates')
+            props_by_moid = {}
+            version = ''
+            resync_pending = True
+            while not self._quit.is_set():
+                try:
+                    upd = pc.WaitForUpdatesEx(version, PC.WaitOptions(maxWaitSeconds=self.max_wait))
+                    perf.count('WaitForUpdatesEx', host=host)
+                except vmodl.query.InvalidCollectorVersion:
+                    logging.info(f'[INV] watch {host}: collector version gap; full resync')
+                    version = ''
+                    props_by_moid = {}
+                    resync_pending = True
+                    continue
+                if upd is None:
+                    continue
+                changed, removed = self._apply(upd, props_by_moid)
+                version = upd.version
+                if resync_pending:
+                    # A truncated set means more of the initial picture is still to come
+                    if getattr(upd, 'truncated', False):
+                        continue
+                    resync_pending = False
+                    vms = [build_vm_record(s, mor, props) for mor, props in props_by_moid.values()]
+                    self.on_event({'kind': 'resync', 'host': host, 'vms': vms})
+                elif changed or removed:
+                    vms = [build_vm_record(s, *props_by_moid[mid]) for mid in changed if mid in props_by_moid]
+                    self.on_event({'kind': 'delta', 'host': host, 'vms': vms, 'removed': removed})
+        finally:
+            self._pc = None
+            try:
+                pc.DestroyPropertyCollector()
+            except Exception:
+                pass
+            try:
+                view.Destroy()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _apply(upd, props_by_moid):
+        changed = []
+        removed = []
+        for fs in (upd.filterSet or []):
+            for ou in (fs.objectSet or []):
+                try:
+                    mid = moid_of(ou.obj)
+                    kind = str(ou.kind)
+                    if kind == 'leave':
+                        props_by_moid.pop(mid, None)
+                        removed.append(mid)
+                        continue
+                    mor, props = props_by_moid.get(mid, (ou.obj, {}))
+                    for ch in (ou.changeSet or []):
+                        if str(ch.op) in ('remove', 'indirectRemove'):
+                            props.pop(ch.name, None)
+                        else:
+                            props[ch.name] = ch.val
+                    props_by_moid[mid] = (mor, props)
+                    changed.append(mid)
+                except Exception as e:
+                    logging.info(f'[INV] watch update parse error: {e}')
+                    traceback.print_exc()
+        return changed, removed